@@ -18,6 +18,7 @@ from app.db.models.user import User
 from app.db.models.board import Board
 from app.db.models.list import List
 from app.db.models.task import Task
+from app.db.models.revoked_token import RevokedToken
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,61 @@
+"""Add task counters to lists and boards
+
+Revision ID: 16884da6dce4
+Revises: 9b1bf62dc200
+Create Date: 2026-10-17 13:37:52.561093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '16884da6dce4'
+down_revision: Union[str, Sequence[str], None] = '9b1bf62dc200'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COUNTERS = ('task_count', 'low_count', 'medium_count', 'high_count', 'urgent_count')
+PRIORITIES = {'low_count': 'LOW', 'high_count': 'HIGH', 'urgent_count': 'URGENT'}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in ('lists', 'boards'):
+        for name in COUNTERS:
+            op.add_column(table, sa.Column(name, sa.Integer(), server_default='0', nullable=False))
+
+    # Rellenar con los valores actuales (igual que `python -m app.cli repair-counters`)
+    list_counts = {
+        'task_count': "SELECT count(*) FROM tasks WHERE tasks.list_id = lists.id",
+        'medium_count': (
+            "SELECT count(*) FROM tasks WHERE tasks.list_id = lists.id "
+            "AND (tasks.priority = 'MEDIUM' OR tasks.priority IS NULL)"
+        ),
+    }
+    for name, priority in PRIORITIES.items():
+        list_counts[name] = (
+            "SELECT count(*) FROM tasks WHERE tasks.list_id = lists.id "
+            f"AND tasks.priority = '{priority}'"
+        )
+    op.execute(
+        "UPDATE lists SET "
+        + ", ".join(f"{name} = ({query})" for name, query in list_counts.items())
+    )
+    op.execute(
+        "UPDATE boards SET "
+        + ", ".join(
+            f"{name} = (SELECT coalesce(sum(lists.{name}), 0) FROM lists "
+            "WHERE lists.board_id = boards.id)"
+            for name in COUNTERS
+        )
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in ('boards', 'lists'):
+        for name in reversed(COUNTERS):
+            op.drop_column(table, name)
@@ -0,0 +1,28 @@
+"""Add users.token_version
+
+Revision ID: 26ea8708d262
+Revises: c0e704f1f3a9
+Create Date: 2026-10-17 09:12:03.114520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '26ea8708d262'
+down_revision: Union[str, Sequence[str], None] = 'c0e704f1f3a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('users', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('users', 'token_version')
@@ -0,0 +1,83 @@
+"""Add task rank
+
+Revision ID: 579e6bf07e50
+Revises: 16884da6dce4
+Create Date: 2026-10-17 15:02:31.718245
+
+"""
+from itertools import groupby
+from typing import Iterator, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '579e6bf07e50'
+down_revision: Union[str, Sequence[str], None] = '16884da6dce4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def _spread_ranks(count: int) -> Iterator[str]:
+    """`count` ranks crecientes de ancho fijo (nunca terminan en "0")"""
+    width = 1
+    while len(DIGITS) ** width <= count:
+        width += 1
+    for number in range(1, count + 1):
+        key = ""
+        for _ in range(width):
+            number, digit = divmod(number, len(DIGITS))
+            key = DIGITS[digit] + key
+        yield key + "i" if key.endswith("0") else key
+
+
+def _backfill_ranks(batch_size: int = 1000) -> None:
+    """
+    Da ranks distintos, en orden de id, a las tareas que comparten posición
+    en su lista, para que mover una entre ellas no obligue a compactar.
+    """
+    conn = op.get_bind()
+    tasks = sa.table(
+        'tasks', sa.column('id'), sa.column('list_id'), sa.column('position'), sa.column('rank')
+    )
+    rows = conn.execute(
+        sa.select(tasks.c.id, tasks.c.list_id, tasks.c.position)
+        .order_by(tasks.c.list_id, tasks.c.position, tasks.c.id)
+    )
+    updates = []
+    for _, group in groupby(rows, key=lambda row: (row.list_id, row.position)):
+        ids = [row.id for row in group]
+        if len(ids) > 1:
+            updates.extend(
+                {"task_id": id, "new_rank": rank} for id, rank in zip(ids, _spread_ranks(len(ids)))
+            )
+    statement = (
+        tasks.update()
+        .where(tasks.c.id == sa.bindparam('task_id'))
+        .values(rank=sa.bindparam('new_rank'))
+    )
+    for start in range(0, len(updates), batch_size):
+        conn.execute(statement, updates[start:start + batch_size])
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('tasks', sa.Column('rank', sa.String(length=64), server_default='i', nullable=False))
+    # Las posiciones enteras existentes siguen siendo válidas; solo se
+    # normalizan las nulas para que el orden (position, rank, id) sea total
+    op.execute("UPDATE tasks SET position = 0 WHERE position IS NULL")
+    _backfill_ranks()
+    op.create_index(
+        'ix_tasks_list_id_position_rank_id', 'tasks', ['list_id', 'position', 'rank', 'id'], unique=False
+    )
+    op.drop_index('ix_tasks_list_id_position_id', table_name='tasks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tasks_list_id_position_id', 'tasks', ['list_id', 'position', 'id'], unique=False)
+    op.drop_index('ix_tasks_list_id_position_rank_id', table_name='tasks')
+    op.drop_column('tasks', 'rank')
@@ -0,0 +1,34 @@
+"""Keyset pagination indexes
+
+Revision ID: 9b1bf62dc200
+Revises: b7cc8979c7c9
+Create Date: 2026-10-17 12:48:10.907311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1bf62dc200'
+down_revision: Union[str, Sequence[str], None] = 'b7cc8979c7c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_boards_owner_id_id', 'boards', ['owner_id', 'id'], unique=False)
+    op.drop_index(op.f('ix_boards_owner_id'), table_name='boards')
+    op.create_index('ix_tasks_list_id_position_id', 'tasks', ['list_id', 'position', 'id'], unique=False)
+    op.drop_index('ix_tasks_list_id_position', table_name='tasks')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_tasks_list_id_position', 'tasks', ['list_id', 'position'], unique=False)
+    op.drop_index('ix_tasks_list_id_position_id', table_name='tasks')
+    op.create_index(op.f('ix_boards_owner_id'), 'boards', ['owner_id'], unique=False)
+    op.drop_index('ix_boards_owner_id_id', table_name='boards')
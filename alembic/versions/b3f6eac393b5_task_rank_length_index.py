@@ -0,0 +1,28 @@
+"""Task rank length index
+
+Revision ID: b3f6eac393b5
+Revises: c5c275555ca6
+Create Date: 2026-10-17 20:05:12.304517
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3f6eac393b5'
+down_revision: Union[str, Sequence[str], None] = 'c5c275555ca6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_tasks_rank_length', 'tasks', [sa.text('length(rank)')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_rank_length', table_name='tasks')
@@ -0,0 +1,32 @@
+"""Add foreign key and position indexes
+
+Revision ID: b7cc8979c7c9
+Revises: 913402e769dd
+Create Date: 2026-10-17 12:05:48.214630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7cc8979c7c9'
+down_revision: Union[str, Sequence[str], None] = '913402e769dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(op.f('ix_boards_owner_id'), 'boards', ['owner_id'], unique=False)
+    op.create_index('ix_lists_board_id_position', 'lists', ['board_id', 'position'], unique=False)
+    op.create_index('ix_tasks_list_id_position', 'tasks', ['list_id', 'position'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_list_id_position', table_name='tasks')
+    op.drop_index('ix_lists_board_id_position', table_name='lists')
+    op.drop_index(op.f('ix_boards_owner_id'), table_name='boards')
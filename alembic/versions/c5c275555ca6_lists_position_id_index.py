@@ -0,0 +1,30 @@
+"""Lists position/id index
+
+Revision ID: c5c275555ca6
+Revises: 579e6bf07e50
+Create Date: 2026-10-17 18:20:44.512908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5c275555ca6'
+down_revision: Union[str, Sequence[str], None] = '579e6bf07e50'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_lists_board_id_position_id', 'lists', ['board_id', 'position', 'id'], unique=False)
+    op.drop_index('ix_lists_board_id_position', table_name='lists')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index('ix_lists_board_id_position', 'lists', ['board_id', 'position'], unique=False)
+    op.drop_index('ix_lists_board_id_position_id', table_name='lists')
@@ -0,0 +1,205 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Iterable, Optional, Tuple
+
+from fastapi import Depends, Response
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.deps import get_current_active_user
+from app.core.config import settings
+from app.core.exceptions import ForbiddenException, NotFoundException
+from app.crud.board import board as board_crud, board_owner_cache
+from app.crud.list import list_crud, list_board_cache
+from app.crud.task import task as task_crud
+from app.db.models.list import List
+from app.db.models.task import Task
+from app.db.models.user import User
+from app.db.session import get_db
+
+# SQLSTATE de Postgres para una violación de clave foránea
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def is_foreign_key_violation(error: IntegrityError) -> bool:
+    orig = error.orig
+    for source in (orig, getattr(orig, "__cause__", None)):
+        if FOREIGN_KEY_VIOLATION in (getattr(source, "sqlstate", None), getattr(source, "pgcode", None)):
+            return True
+    # SQLite no da código, solo el mensaje
+    return "FOREIGN KEY constraint failed" in str(orig)
+
+
+class AuthorizationContext:
+    """
+    Comprobaciones de permisos memoizadas durante una petición.
+
+    Guarda el owner de cada tablero y lista consultados, y las listas y
+    tareas cargadas, para que comprobar dos veces el mismo recurso no
+    repita la consulta. Antes de ir a la base de datos consulta también
+    las caches compartidas board_owner_cache y list_board_cache.
+
+    Esas caches son locales a cada proceso: un tablero o lista borrado en
+    otro proceso puede seguir pareciendo válido hasta que caduque la
+    entrada. Las escrituras que cuelgan de uno de ellos van dentro de
+    `parent_guard`, que convierte el fallo de la clave foránea en un 404.
+    """
+
+    def __init__(self, db: AsyncSession, user: User, response: Optional[Response] = None):
+        self.db = db
+        self.user_id = user.id
+        self.response = response
+        self.queries = 0
+        self.saved = 0
+        self._board_owners: Dict[int, Optional[int]] = {}
+        self._list_boards: Dict[int, Optional[int]] = {}
+        self._lists: Dict[int, List] = {}
+        self._tasks: Dict[Tuple[int, bool], Task] = {}
+
+    def _record(self, query: bool) -> None:
+        if query:
+            self.queries += 1
+        else:
+            self.saved += 1
+        if self.response is not None and settings.AUTHZ_DEBUG_HEADERS:
+            self.response.headers["X-Authz-Queries"] = str(self.queries)
+            self.response.headers["X-Authz-Saved"] = str(self.saved)
+
+    def _check_owner(self, owner_id: Optional[int], not_found: str) -> None:
+        if owner_id is None:
+            raise NotFoundException(not_found)
+        if owner_id != self.user_id:
+            raise ForbiddenException("Not enough permissions")
+
+    def _remember(self, list_id: int, board_id: int, owner_id: int) -> None:
+        self._list_boards[list_id] = board_id
+        self._board_owners[board_id] = owner_id
+        list_board_cache.set(list_id, board_id)
+        board_owner_cache.set(board_id, owner_id)
+
+    def _remember_list(self, list_obj: List, owner_id: int) -> None:
+        self._remember(list_obj.id, list_obj.board_id, owner_id)
+
+    def _board_owner(self, board_id: int) -> Tuple[bool, Optional[int]]:
+        """(conocido, owner_id) de un tablero sin consultar la base de datos"""
+        if board_id not in self._board_owners:
+            owner_id = board_owner_cache.get(board_id)
+            if owner_id is None:
+                return False, None
+            self._board_owners[board_id] = owner_id
+        return True, self._board_owners[board_id]
+
+    def _list_owner(self, list_id: int) -> Tuple[bool, Optional[int]]:
+        """(conocido, owner_id) de una lista sin consultar la base de datos"""
+        if list_id not in self._list_boards:
+            board_id = list_board_cache.get(list_id)
+            if board_id is None:
+                return False, None
+            self._list_boards[list_id] = board_id
+        board_id = self._list_boards[list_id]
+        if board_id is None:
+            return True, None
+        return self._board_owner(board_id)
+
+    async def require_board(self, board_id: int) -> None:
+        """El tablero existe y pertenece al usuario"""
+        known, owner_id = self._board_owner(board_id)
+        if known:
+            self._record(query=False)
+        else:
+            self._record(query=True)
+            owner_id = await board_crud.get_owner_id(self.db, id=board_id)
+            self._board_owners[board_id] = owner_id
+            if owner_id is not None:
+                board_owner_cache.set(board_id, owner_id)
+        self._check_owner(owner_id, "Board not found")
+
+    async def require_list(self, list_id: int) -> None:
+        """La lista existe y pertenece a un tablero del usuario"""
+        known, owner_id = self._list_owner(list_id)
+        if known:
+            self._record(query=False)
+        else:
+            self._record(query=True)
+            row = await list_crud.get_with_owner(self.db, id=list_id)
+            if row is None:
+                self._list_boards[list_id] = None
+            else:
+                list_obj, owner_id = row
+                self._lists[list_id] = list_obj
+                self._remember_list(list_obj, owner_id)
+        self._check_owner(owner_id, "List not found")
+
+    @asynccontextmanager
+    async def parent_guard(
+            self,
+            not_found: str,
+            *,
+            list_ids: Iterable[int] = (),
+            board_ids: Iterable[int] = (),
+    ) -> AsyncIterator[None]:
+        """
+        Escritura que referencia las listas `list_ids` o los tableros
+        `board_ids`. Si alguno ya no existe (la comprobación salió de una
+        cache desactualizada) se hace rollback, se descartan sus entradas
+        y se lanza NotFoundException(not_found).
+        """
+        try:
+            yield
+        except IntegrityError as e:
+            if not is_foreign_key_violation(e):
+                raise
+            await self.db.rollback()
+            for list_id in list_ids:
+                self._list_boards.pop(list_id, None)
+                list_board_cache.pop(list_id)
+            for board_id in board_ids:
+                self._board_owners.pop(board_id, None)
+                board_owner_cache.pop(board_id)
+            raise NotFoundException(not_found)
+
+    async def get_list(self, list_id: int) -> List:
+        """Lista del usuario, cargada junto con su owner"""
+        if list_id in self._lists:
+            await self.require_list(list_id)
+            return self._lists[list_id]
+
+        self._record(query=True)
+        row = await list_crud.get_with_owner(self.db, id=list_id)
+        if row is None:
+            self._list_boards[list_id] = None
+            raise NotFoundException("List not found")
+
+        list_obj, owner_id = row
+        self._lists[list_id] = list_obj
+        self._remember_list(list_obj, owner_id)
+        self._check_owner(owner_id, "List not found")
+        return list_obj
+
+    async def get_task(self, task_id: int, *, with_description: bool = True) -> Task:
+        """Tarea del usuario, cargada junto con su owner"""
+        key = (task_id, with_description)
+        if key in self._tasks:
+            task = self._tasks[key]
+            await self.require_list(task.list_id)
+            return task
+
+        self._record(query=True)
+        row = await task_crud.get_with_owner(
+            self.db, id=task_id, with_description=with_description
+        )
+        if row is None:
+            raise NotFoundException("Task not found")
+
+        task, board_id, owner_id = row
+        self._tasks[key] = task
+        self._remember(task.list_id, board_id, owner_id)
+        self._check_owner(owner_id, "Task not found")
+        return task
+
+
+async def get_authz(
+        response: Response,
+        db: AsyncSession = Depends(get_db),
+        current_user: User = Depends(get_current_active_user)
+) -> AuthorizationContext:
+    return AuthorizationContext(db, current_user, response)
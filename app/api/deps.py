@@ -1,25 +1,78 @@
-from typing import Optional
-from fastapi import Depends, HTTPException, status
+import hashlib
+import ipaddress
+import time
+from typing import Any, Dict, Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import TTLCache
 from app.core.config import settings
 from app.core.exceptions import UnauthorizedException
+from app.core.security import TokenError, access_token_revocations, token_codec
 from app.db.session import get_db
 from app.crud.user import user as user_crud
 from app.db.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Redes desde las que se acepta X-Forwarded-For
+trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in settings.TRUSTED_PROXIES]
 
-async def get_current_user(
-        db: AsyncSession = Depends(get_db),
-        token: str = Depends(oauth2_scheme)
-) -> User:
+
+def _is_trusted_proxy(host: str) -> bool:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in trusted_proxies)
+
+
+def get_client_ip(request: Request) -> str:
+    """
+    IP del cliente. Si la conexión viene de un proxy de confianza se recorre
+    X-Forwarded-For de derecha a izquierda y se toma la primera dirección que
+    no es un proxy de confianza; las anteriores las puede inventar el cliente.
+    """
+    host = request.client.host if request.client else "unknown"
+    if not _is_trusted_proxy(host):
+        return host
+    forwarded = [
+        address.strip()
+        for address in request.headers.get("x-forwarded-for", "").split(",")
+        if address.strip()
+    ]
+    for address in reversed(forwarded):
+        host = address
+        if not _is_trusted_proxy(address):
+            break
+    return host
+
+
+# Payloads de tokens ya verificados, indexados por el digest del token
+token_cache: TTLCache[Dict[str, Any]] = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=0)
+
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """
+    token_codec.decode con memoización.
+
+    La firma de un token no cambia durante su vida, así que tras verificarlo
+    una vez se guarda el payload hasta su `exp`. Devuelve una copia para que
+    el llamador pueda modificarla.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = token_codec.decode(token)
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            token_cache.set(digest, payload, ttl=exp - time.time())
+    return dict(payload)
+
+
+def _decode_access_token(token: str) -> Dict[str, Any]:
+    try:
+        payload = decode_token(token)
         user_id_str: str = payload.get("sub")
         token_type: str = payload.get("type")
 
@@ -30,34 +83,87 @@ async def get_current_user(
         if token_type != "access":
             raise UnauthorizedException("Invalid token type")
 
-        user_id = int(user_id_str)
+        payload["sub"] = int(user_id_str)
 
-    except (JWTError, ValueError, TypeError) as e:
+    except (TokenError, ValueError, TypeError) as e:
         raise UnauthorizedException("Could not validate credentials")
 
-    user = await user_crud.get(db, id=user_id)
+    return payload
+
+
+def _check_token_version(user_id: int, version: Optional[int]) -> None:
+    if version is not None and access_token_revocations.is_revoked(user_id, version):
+        raise UnauthorizedException("Token has been revoked")
+
+
+async def _authenticate(db: AsyncSession, token: str, *, load_profile: bool) -> User:
+    payload = _decode_access_token(token)
+    user_id = payload["sub"]
+    version = payload.get("ver")
+    _check_token_version(user_id, version)
+
+    # Token autocontenido: se autoriza solo con los claims verificados
+    if settings.ACCESS_TOKEN_SELF_CONTAINED and version is not None and not load_profile:
+        return User(
+            id=user_id,
+            username=payload.get("usr"),
+            is_active=bool(payload.get("act")),
+            token_version=version,
+        )
+
+    user = await user_crud.get_principal(db, id=user_id)
     if user is None:
         raise UnauthorizedException("User not found")
 
+    if version is not None and version < (user.token_version or 0):
+        raise UnauthorizedException("Token has been revoked")
+
+    return user
+
+
+async def get_current_user(
+        db: AsyncSession = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+) -> User:
+    return await _authenticate(db, token, load_profile=False)
+
+
+async def get_current_user_profile(
+        db: AsyncSession = Depends(get_db),
+        token: str = Depends(oauth2_scheme)
+) -> User:
+    """
+    Igual que get_current_user pero siempre con la fila completa del usuario
+    (email, fechas), incluso con tokens autocontenidos
+    """
+    return await _authenticate(db, token, load_profile=True)
+
+
+def _ensure_active(user: User) -> User:
+    if not user.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
     return user
 
 
 async def get_current_active_user(
         current_user: User = Depends(get_current_user)
 ) -> User:
-    if not current_user.is_active:
-        raise HTTPException(status_code=400, detail="Inactive user")
-    return current_user
+    return _ensure_active(current_user)
+
 
+async def get_current_active_user_profile(
+        current_user: User = Depends(get_current_user_profile)
+) -> User:
+    return _ensure_active(current_user)
 
-def verify_refresh_token(token: str) -> int:
+
+def decode_refresh_token(token: str) -> Dict[str, Any]:
     """
-    Verificar que el token sea un refresh token válido y retornar el user_id
+    Verificar que el token sea un refresh token válido y retornar su payload
+    (con `sub` ya convertido a int)
     """
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
-        )
+        payload = decode_token(token)
         user_id_str: str = payload.get("sub")
         token_type: str = payload.get("type")
 
@@ -68,7 +174,8 @@ def verify_refresh_token(token: str) -> int:
         if token_type != "refresh":
             raise UnauthorizedException("Invalid token type")
 
-        return int(user_id_str)
+        payload["sub"] = int(user_id_str)
+        return payload
 
-    except (JWTError, ValueError, TypeError) as e:
+    except (TokenError, ValueError, TypeError) as e:
         raise UnauthorizedException("Invalid refresh token")
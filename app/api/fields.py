@@ -0,0 +1,31 @@
+from typing import Any, List, Optional, Sequence, Type
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.core.exceptions import BadRequestException
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """
+    Campos pedidos en `?fields=a,b`, validados contra el schema de respuesta.
+    `id` se incluye siempre. Retorna None si no se pidió un subconjunto.
+    """
+    if not fields:
+        return None
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in schema.model_fields]
+    if unknown:
+        raise BadRequestException(f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def sparse_response(rows: Sequence[Any], fields: List[str], response: Response) -> JSONResponse:
+    """
+    Serializa solo `fields` de cada fila, sin tocar las columnas diferidas.
+    Conserva las cabeceras ya añadidas a `response` (p. ej. X-Next-Cursor).
+    """
+    content = [{name: getattr(row, name) for name in fields} for row in rows]
+    return JSONResponse(jsonable_encoder(content), headers=dict(response.headers))
@@ -1,19 +1,27 @@
-from datetime import timedelta
+from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
-from app.core.security import create_access_token, create_refresh_token
-from app.core.exceptions import ConflictException, UnauthorizedException
+from app.core.security import access_token_claims, create_access_token, create_refresh_token
+from app.core.exceptions import ConflictException, ServiceUnavailableException, UnauthorizedException
+from app.core.throttle import login_throttle
 from app.db.session import get_db
 from app.schemas import UserCreate, UserResponse, Token
 from app.schemas.token import RefreshTokenRequest, TokenRefreshResponse
-from app.crud.user import user as user_crud
+from app.crud.user import duplicate_field, user as user_crud
+from app.crud.revoked_token import revoked_token as revoked_token_crud
 from app.db.models.user import User
-from app.api.deps import get_current_active_user, verify_refresh_token
+from app.api.deps import get_client_ip, get_current_active_user_profile, decode_refresh_token
 
 router = APIRouter()
 
+DUPLICATE_MESSAGES = {
+    "email": "Email already registered",
+    "username": "Username already taken",
+}
+
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register(
@@ -24,39 +32,52 @@ async def register(
     """
     Registrar un nuevo usuario
     """
-    user = await user_crud.get_by_email(db, email=user_in.email)
-    if user:
-        raise ConflictException("Email already registered")
-
-    user = await user_crud.get_by_username(db, username=user_in.username)
-    if user:
-        raise ConflictException("Username already taken")
-
-    user = await user_crud.create(db, obj_in=user_in)
-    return user
+    # Comprobar duplicados antes de gastar CPU en bcrypt
+    duplicate = await user_crud.get_conflicting_field(
+        db, email=user_in.email, username=user_in.username
+    )
+    if duplicate is None:
+        try:
+            return await user_crud.create(db, obj_in=user_in)
+        except IntegrityError as e:
+            duplicate = duplicate_field(e)
+            if duplicate is None:
+                raise
+    raise ConflictException(DUPLICATE_MESSAGES[duplicate])
 
 
 @router.post("/login", response_model=Token)
 async def login(
         db: AsyncSession = Depends(get_db),
-        form_data: OAuth2PasswordRequestForm = Depends()
+        form_data: OAuth2PasswordRequestForm = Depends(),
+        client_ip: str = Depends(get_client_ip)
 ) -> Token:
     """
     Login con email y password (OAuth2 compatible)
 
     Retorna access_token (válido 30 min) y refresh_token (válido 7 días)
     """
-    user = await user_crud.authenticate(
-        db, email=form_data.username, password=form_data.password
-    )
+    # Rechazar ráfagas antes de gastar CPU en bcrypt
+    login_throttle.acquire(form_data.username, client_ip)
+
+    try:
+        user = await user_crud.authenticate(
+            db, email=form_data.username, password=form_data.password
+        )
+    except ServiceUnavailableException:
+        # El pool de bcrypt está lleno: el intento no llegó a verificarse
+        login_throttle.refund(form_data.username, client_ip)
+        raise
     if not user:
         raise UnauthorizedException("Incorrect email or password")
 
+    login_throttle.refund(form_data.username, client_ip)
+
     if not user.is_active:
         raise UnauthorizedException("Inactive user")
 
     # Crear tokens
-    access_token = create_access_token(data={"sub": str(user.id)})
+    access_token = create_access_token(data=access_token_claims(user))
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
 
     return Token(
@@ -77,10 +98,15 @@ async def refresh_token(
 
     - Envía el refresh_token obtenido en el login
     - Retorna un nuevo access_token y opcionalmente un nuevo refresh_token
-    - El refresh_token debe ser válido (no expirado)
+    - El refresh_token debe ser válido (no expirado ni usado antes)
     """
     # Verificar el refresh token
-    user_id = verify_refresh_token(refresh_request.refresh_token)
+    payload = decode_refresh_token(refresh_request.refresh_token)
+    user_id = payload["sub"]
+    jti = payload.get("jti")
+
+    if jti and await revoked_token_crud.is_revoked(db, jti=jti):
+        raise UnauthorizedException("Refresh token has been revoked")
 
     # Verificar que el usuario existe y está activo
     user = await user_crud.get(db, id=user_id)
@@ -90,8 +116,16 @@ async def refresh_token(
     if not user.is_active:
         raise UnauthorizedException("Inactive user")
 
+    # Revocar el refresh token usado (rotación)
+    if jti:
+        revoked = await revoked_token_crud.revoke(
+            db, jti=jti, expires_at=datetime.utcfromtimestamp(payload["exp"])
+        )
+        if not revoked:
+            raise UnauthorizedException("Refresh token has been revoked")
+
     # Crear nuevo access token
-    new_access_token = create_access_token(data={"sub": str(user.id)})
+    new_access_token = create_access_token(data=access_token_claims(user))
 
     # Opción 1: Retornar solo nuevo access_token (refresh_token sigue siendo el mismo)
     # return TokenRefreshResponse(
@@ -111,7 +145,7 @@ async def refresh_token(
 
 @router.get("/me", response_model=UserResponse)
 async def read_users_me(
-        current_user: User = Depends(get_current_active_user)
+        current_user: User = Depends(get_current_active_user_profile)
 ) -> UserResponse:
     """
     Obtener usuario actual
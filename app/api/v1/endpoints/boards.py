@@ -1,13 +1,20 @@
-from typing import List
-from fastapi import APIRouter, Depends, status, Query
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Response, status, Query
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.authz import AuthorizationContext, get_authz
 from app.api.deps import get_current_active_user
-from app.core.exceptions import NotFoundException, ForbiddenException
+from app.api.fields import parse_fields, sparse_response
+from app.core.exceptions import BadRequestException, NotFoundException, ForbiddenException
+from app.core.config import settings
+from app.core.pagination import decode_cursor, next_cursor, set_next_cursor
 from app.db.session import get_db
 from app.db.models.user import User
-from app.schemas import BoardCreate, BoardUpdate, BoardResponse, BoardWithLists
+from app.schemas import (
+    BoardCreate, BoardUpdate, BoardResponse, BoardWithLists, BoardFull, ListResponse, ReorderRequest
+)
 
 from app.crud.board import board as board_crud
+from app.crud.list import list_crud
 
 router = APIRouter()
 
@@ -30,17 +37,28 @@ async def create_board(
 
 @router.get("/", response_model=List[BoardResponse])
 async def list_boards(
+        response: Response,
         db: AsyncSession = Depends(get_db),
         skip: int = Query(0, ge=0),
         limit: int = Query(100, ge=1, le=100),
+        cursor: Optional[str] = Query(None),
+        fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
         current_user: User = Depends(get_current_active_user)
 ) -> List[BoardResponse]:
     """
-    Listar todos los tableros del usuario actual
+    Listar todos los tableros del usuario actual.
+
+    Si la página está llena, X-Next-Cursor trae el cursor de la siguiente;
+    con `cursor` se ignora `skip`.
     """
+    after = decode_cursor(cursor, int) if cursor else None
+    selected = parse_fields(fields, BoardResponse)
     boards = await board_crud.get_by_owner(
-        db, owner_id=current_user.id, skip=skip, limit=limit
+        db, owner_id=current_user.id, skip=skip, limit=limit, after=after, fields=selected
     )
+    set_next_cursor(response, boards, limit, "id")
+    if selected:
+        return sparse_response(boards, selected, response)
     return boards
 
 
@@ -63,6 +81,63 @@ async def get_board(
     return board
 
 
+@router.get("/{board_id}/full", response_model=BoardFull)
+async def get_board_full(
+        board_id: int,
+        tasks_limit: int = Query(settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_SIZE_MAX),
+        db: AsyncSession = Depends(get_db),
+        authz: AuthorizationContext = Depends(get_authz)
+) -> BoardFull:
+    """
+    Obtener un tablero con sus listas y las primeras `tasks_limit` tareas de
+    cada lista, ordenadas por posición.
+
+    El resto de tareas de una lista se obtiene de GET /tasks/list/{id} con su
+    `tasks_next_cursor`.
+    """
+    # Comprobar el owner antes de cargar listas y tareas
+    await authz.require_board(board_id)
+
+    full = await board_crud.get_full(db, id=board_id, tasks_limit=tasks_limit)
+    if not full:
+        raise NotFoundException("Board not found")
+
+    board, tasks = full
+    return BoardFull.model_validate(
+        {
+            **BoardResponse.model_validate(board).model_dump(),
+            "lists": [
+                {
+                    **ListResponse.model_validate(list_obj).model_dump(),
+                    "tasks": tasks[list_obj.id],
+                    "tasks_next_cursor": next_cursor(
+                        tasks[list_obj.id], tasks_limit, "position", "rank", "id"
+                    ),
+                }
+                for list_obj in board.lists
+            ],
+        },
+        from_attributes=True,
+    )
+
+
+@router.post("/{board_id}/reorder-lists", status_code=status.HTTP_204_NO_CONTENT)
+async def reorder_lists(
+        board_id: int,
+        reorder_in: ReorderRequest,
+        db: AsyncSession = Depends(get_db),
+        authz: AuthorizationContext = Depends(get_authz)
+):
+    """
+    Reordenar las listas de un tablero en una sola transacción
+    """
+    await authz.require_board(board_id)
+
+    if not await list_crud.reorder(db, ids=reorder_in.ids, parent="board_id", parent_id=board_id):
+        raise BadRequestException("ids must contain every list of this board exactly once")
+    return None
+
+
 @router.put("/{board_id}", response_model=BoardResponse)
 async def update_board(
         board_id: int,
@@ -1,14 +1,16 @@
-from typing import List as TypingList
-from fastapi import APIRouter, Depends, status
+from typing import List as TypingList, Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_current_active_user
-from app.core.exceptions import NotFoundException, ForbiddenException
+from app.api.authz import AuthorizationContext, get_authz
+from app.api.fields import parse_fields, sparse_response
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.core.pagination import TOTAL_COUNT_HEADER, next_cursor
 from app.db.session import get_db
-from app.db.models.user import User
-from app.schemas import ListCreate, ListUpdate, ListResponse, ListWithTasks
+from app.schemas import ListCreate, ListUpdate, ListResponse, ListWithTasks, ReorderRequest
 
 from app.crud.list import list_crud
-from app.crud.board import board as board_crud
+from app.crud.task import task as task_crud
 
 router = APIRouter()
 
@@ -18,63 +20,84 @@ async def create_list(
         *,
         db: AsyncSession = Depends(get_db),
         list_in: ListCreate,
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> ListResponse:
     """
     Crear una nueva lista (estado) en un tablero
     """
     # Verificar que el tablero existe y pertenece al usuario
-    board = await board_crud.get(db, id=list_in.board_id)
-    if not board:
-        raise NotFoundException("Board not found")
+    await authz.require_board(list_in.board_id)
 
-    if board.owner_id != current_user.id:
-        raise ForbiddenException("Not enough permissions")
-
-    list_obj = await list_crud.create(db, obj_in=list_in)
+    async with authz.parent_guard("Board not found", board_ids=[list_in.board_id]):
+        list_obj = await list_crud.create(db, obj_in=list_in)
     return list_obj
 
 
 @router.get("/board/{board_id}", response_model=TypingList[ListResponse])
 async def list_lists(
         board_id: int,
+        response: Response,
+        fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> TypingList[ListResponse]:
     """
     Listar todas las listas de un tablero
     """
     # Verificar permisos
-    board = await board_crud.get(db, id=board_id)
-    if not board:
-        raise NotFoundException("Board not found")
-
-    if board.owner_id != current_user.id:
-        raise ForbiddenException("Not enough permissions")
+    await authz.require_board(board_id)
 
-    lists = await list_crud.get_by_board(db, board_id=board_id)
+    selected = parse_fields(fields, ListResponse)
+    lists = await list_crud.get_by_board(db, board_id=board_id, fields=selected)
+    if selected:
+        return sparse_response(lists, selected, response)
     return lists
 
 
 @router.get("/{list_id}", response_model=ListWithTasks)
 async def get_list(
         list_id: int,
+        response: Response,
+        tasks_limit: int = Query(settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_SIZE_MAX),
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> ListWithTasks:
     """
-    Obtener una lista con todas sus tareas
-    """
-    list_obj = await list_crud.get_with_tasks(db, id=list_id)
-    if not list_obj:
-        raise NotFoundException("List not found")
+    Obtener una lista con sus primeras `tasks_limit` tareas.
 
+    X-Total-Count trae el total de tareas; el resto se obtiene de
+    GET /tasks/list/{id} con `tasks_next_cursor`.
+    """
     # Verificar permisos
-    board = await board_crud.get(db, id=list_obj.board_id)
-    if board.owner_id != current_user.id:
-        raise ForbiddenException("Not enough permissions")
+    list_obj = await authz.get_list(list_id)
+
+    tasks = await task_crud.get_by_list(db, list_id=list_id, limit=tasks_limit)
+    response.headers[TOTAL_COUNT_HEADER] = str(list_obj.task_count)
+    return ListWithTasks.model_validate(
+        {
+            **ListResponse.model_validate(list_obj).model_dump(),
+            "tasks": tasks,
+            "tasks_next_cursor": next_cursor(tasks, tasks_limit, "position", "rank", "id"),
+        },
+        from_attributes=True,
+    )
+
+
+@router.post("/{list_id}/reorder", status_code=status.HTTP_204_NO_CONTENT)
+async def reorder_tasks(
+        list_id: int,
+        reorder_in: ReorderRequest,
+        db: AsyncSession = Depends(get_db),
+        authz: AuthorizationContext = Depends(get_authz)
+):
+    """
+    Reordenar las tareas de una lista en una sola transacción
+    """
+    await authz.require_list(list_id)
 
-    return list_obj
+    if not await task_crud.reorder(db, ids=reorder_in.ids, parent="list_id", parent_id=list_id):
+        raise BadRequestException("ids must contain every task of this list exactly once")
+    return None
 
 
 @router.put("/{list_id}", response_model=ListResponse)
@@ -82,19 +105,13 @@ async def update_list(
         list_id: int,
         list_in: ListUpdate,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> ListResponse:
     """
     Actualizar una lista
     """
-    list_obj = await list_crud.get(db, id=list_id)
-    if not list_obj:
-        raise NotFoundException("List not found")
-
     # Verificar permisos
-    board = await board_crud.get(db, id=list_obj.board_id)
-    if board.owner_id != current_user.id:
-        raise ForbiddenException("Not enough permissions")
+    list_obj = await authz.get_list(list_id)
 
     list_obj = await list_crud.update(db, db_obj=list_obj, obj_in=list_in)
     return list_obj
@@ -104,19 +121,13 @@ async def update_list(
 async def delete_list(
         list_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ):
     """
     Eliminar una lista y todas sus tareas
     """
-    list_obj = await list_crud.get(db, id=list_id)
-    if not list_obj:
-        raise NotFoundException("List not found")
-
     # Verificar permisos
-    board = await board_crud.get(db, id=list_obj.board_id)
-    if board.owner_id != current_user.id:
-        raise ForbiddenException("Not enough permissions")
+    list_obj = await authz.get_list(list_id)
 
     await list_crud.remove(db, id=list_id)
     return None
\ No newline at end of file
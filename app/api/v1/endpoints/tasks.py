@@ -1,75 +1,95 @@
-from typing import List as TypingList
-from fastapi import APIRouter, Depends, status
+from typing import List as TypingList, Optional
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.api.deps import get_current_active_user
-from app.core.exceptions import NotFoundException, ForbiddenException, BadRequestException
+from app.api.authz import AuthorizationContext, get_authz
+from app.api.fields import parse_fields, sparse_response
+from app.core.config import settings
+from app.core.exceptions import BadRequestException
+from app.core.pagination import TOTAL_COUNT_HEADER, decode_cursor, set_next_cursor
 from app.db.session import get_db
-from app.db.models.user import User
-from app.schemas import TaskCreate, TaskUpdate, TaskResponse, TaskMove
+from app.schemas import TaskCreate, TaskBulkCreate, TaskUpdate, TaskResponse, TaskMove
 
 from app.crud.task import task as task_crud
-from app.crud.list import list_crud
-from app.crud.board import board as board_crud
 
 router = APIRouter()
 
 
-async def verify_list_permission(
-        db: AsyncSession, list_id: int, user_id: int
-) -> None:
-    """Helper para verificar permisos sobre una lista"""
-    list_obj = await list_crud.get(db, id=list_id)
-    if not list_obj:
-        raise NotFoundException("List not found")
-
-    board = await board_crud.get(db, id=list_obj.board_id)
-    if board.owner_id != user_id:
-        raise ForbiddenException("Not enough permissions")
-
-
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
         *,
         db: AsyncSession = Depends(get_db),
         task_in: TaskCreate,
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> TaskResponse:
     """
     Crear una nueva tarea en una lista
     """
-    await verify_list_permission(db, task_in.list_id, current_user.id)
-    task = await task_crud.create(db, obj_in=task_in)
+    await authz.require_list(task_in.list_id)
+    async with authz.parent_guard("List not found", list_ids=[task_in.list_id]):
+        task = await task_crud.create(db, obj_in=task_in)
     return task
 
 
+@router.post(
+    "/bulk", response_model=TypingList[TaskResponse], status_code=status.HTTP_201_CREATED
+)
+async def create_tasks_bulk(
+        *,
+        db: AsyncSession = Depends(get_db),
+        tasks_in: TaskBulkCreate,
+        authz: AuthorizationContext = Depends(get_authz)
+) -> TypingList[TaskResponse]:
+    """
+    Crear varias tareas, en una o más listas, en una sola transacción.
+    Se devuelven en el mismo orden en que se enviaron.
+    """
+    list_ids = list(dict.fromkeys(task_in.list_id for task_in in tasks_in.tasks))
+    for list_id in list_ids:
+        await authz.require_list(list_id)
+    async with authz.parent_guard("List not found", list_ids=list_ids):
+        tasks = await task_crud.create_many(db, objs_in=tasks_in.tasks)
+    return tasks
+
+
 @router.get("/list/{list_id}", response_model=TypingList[TaskResponse])
 async def list_tasks(
         list_id: int,
+        response: Response,
+        limit: int = Query(settings.TASK_PAGE_SIZE, ge=1, le=settings.TASK_PAGE_SIZE_MAX),
+        cursor: Optional[str] = Query(None),
+        fields: Optional[str] = Query(None, description="Campos a devolver, separados por comas"),
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> TypingList[TaskResponse]:
     """
-    Listar todas las tareas de una lista
+    Listar las tareas de una lista de `limit` en `limit`.
+
+    X-Total-Count trae el total de tareas de la lista y, si la página está
+    llena, X-Next-Cursor el cursor de la siguiente.
     """
-    await verify_list_permission(db, list_id, current_user.id)
-    tasks = await task_crud.get_by_list(db, list_id=list_id)
+    # La lista trae el contador de tareas que va en X-Total-Count
+    list_obj = await authz.get_list(list_id)
+    after = decode_cursor(cursor, int, str, int) if cursor else None
+    selected = parse_fields(fields, TaskResponse)
+    tasks = await task_crud.get_by_list(
+        db, list_id=list_id, limit=limit, after=after, fields=selected
+    )
+    set_next_cursor(response, tasks, limit, "position", "rank", "id")
+    response.headers[TOTAL_COUNT_HEADER] = str(list_obj.task_count)
+    if selected:
+        return sparse_response(tasks, selected, response)
     return tasks
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
         task_id: int,
-        db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> TaskResponse:
     """
     Obtener una tarea específica
     """
-    task = await task_crud.get(db, id=task_id)
-    if not task:
-        raise NotFoundException("Task not found")
-
-    await verify_list_permission(db, task.list_id, current_user.id)
+    task = await authz.get_task(task_id)
     return task
 
 
@@ -78,16 +98,12 @@ async def update_task(
         task_id: int,
         task_in: TaskUpdate,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> TaskResponse:
     """
     Actualizar una tarea
     """
-    task = await task_crud.get(db, id=task_id)
-    if not task:
-        raise NotFoundException("Task not found")
-
-    await verify_list_permission(db, task.list_id, current_user.id)
+    task = await authz.get_task(task_id)
     task = await task_crud.update(db, db_obj=task, obj_in=task_in)
     return task
 
@@ -97,25 +113,36 @@ async def move_task(
         task_id: int,
         move_data: TaskMove,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ) -> TaskResponse:
     """
-    Mover una tarea a otra lista (cambiar de estado)
-    """
-    task = await task_crud.get(db, id=task_id)
-    if not task:
-        raise NotFoundException("Task not found")
+    Mover una tarea a otra lista (cambiar de estado).
 
+    Con previous_id/next_id se coloca entre esas tareas de la lista destino
+    modificando solo la tarea movida.
+    """
     # Verificar permisos en la lista origen
-    await verify_list_permission(db, task.list_id, current_user.id)
+    task = await authz.get_task(task_id)
 
-    # Verificar permisos en la lista destino
-    await verify_list_permission(db, move_data.list_id, current_user.id)
+    # Verificar permisos en la lista destino (sin consulta si es la misma)
+    await authz.require_list(move_data.list_id)
 
     # Mover la tarea
-    task = await task_crud.move_to_list(
-        db, task=task, list_id=move_data.list_id, position=move_data.position
-    )
+    async with authz.parent_guard("List not found", list_ids=[move_data.list_id]):
+        if move_data.previous_id is not None or move_data.next_id is not None:
+            task = await task_crud.place(
+                db,
+                task=task,
+                list_id=move_data.list_id,
+                previous_id=move_data.previous_id,
+                next_id=move_data.next_id,
+            )
+        else:
+            task = await task_crud.move_to_list(
+                db, task=task, list_id=move_data.list_id, position=move_data.position
+            )
+    if task is None:
+        raise BadRequestException("Neighbour tasks must belong to the destination list")
     return task
 
 
@@ -123,15 +150,11 @@ async def move_task(
 async def delete_task(
         task_id: int,
         db: AsyncSession = Depends(get_db),
-        current_user: User = Depends(get_current_active_user)
+        authz: AuthorizationContext = Depends(get_authz)
 ):
     """
     Eliminar una tarea
     """
-    task = await task_crud.get(db, id=task_id)
-    if not task:
-        raise NotFoundException("Task not found")
-
-    await verify_list_permission(db, task.list_id, current_user.id)
+    await authz.get_task(task_id, with_description=False)
     await task_crud.remove(db, id=task_id)
-    return None
\ No newline at end of file
+    return None
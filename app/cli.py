@@ -0,0 +1,58 @@
+"""
+Comandos de mantenimiento.
+
+    python -m app.cli calibrate-bcrypt --target-ms 250
+    python -m app.cli repair-counters
+    python -m app.cli compact-ranks
+"""
+import argparse
+import asyncio
+import logging
+
+from app.core.security import calibrate_bcrypt_rounds
+
+
+def calibrate_bcrypt(args: argparse.Namespace) -> None:
+    rounds = calibrate_bcrypt_rounds(args.target_ms)
+    print(f"BCRYPT_ROUNDS={rounds}")
+
+
+def repair_counters(args: argparse.Namespace) -> None:
+    from app.db.maintenance import repair_counters as run
+
+    asyncio.run(run())
+
+
+def compact_ranks(args: argparse.Namespace) -> None:
+    from app.db.maintenance import compact_task_ranks
+
+    print(f"Compacted {asyncio.run(compact_task_ranks())} lists")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    calibrate = subparsers.add_parser(
+        "calibrate-bcrypt", help="Calcular el coste de bcrypt para esta máquina"
+    )
+    calibrate.add_argument("--target-ms", type=float, default=250.0)
+    calibrate.set_defaults(func=calibrate_bcrypt)
+
+    repair = subparsers.add_parser(
+        "repair-counters", help="Recalcular los contadores de tareas de listas y tableros"
+    )
+    repair.set_defaults(func=repair_counters)
+
+    compact = subparsers.add_parser(
+        "compact-ranks", help="Compactar los ranks de tareas demasiado largos"
+    )
+    compact.set_defaults(func=compact_ranks)
+
+    logging.basicConfig(level=logging.INFO)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List
+from typing import List, Optional
 from functools import lru_cache
 
 
@@ -8,6 +9,9 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Kanban API"
     VERSION: str = "1.0.0"
     API_V1_STR: str = "/api/v1"
+    # Procesos que sirven la API (la misma variable que leen uvicorn y gunicorn).
+    # Las caches y registros en memoria son locales a cada proceso.
+    WEB_CONCURRENCY: int = 1
 
     # CORS
     BACKEND_CORS_ORIGINS: List[str]
@@ -19,8 +23,93 @@ class Settings(BaseSettings):
     # Security
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    # Backend de JWT ("jose" o "pyjwt") y claves PEM para algoritmos asimétricos
+    TOKEN_BACKEND: str = "jose"
+    TOKEN_PRIVATE_KEY: Optional[str] = None
+    TOKEN_PUBLIC_KEY: Optional[str] = None
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Incluir en el access token los claims necesarios para autorizar sin consultar la BD.
+    # Las revocaciones solo se registran en el proceso que las hace, así que no
+    # se admite con WEB_CONCURRENCY > 1
+    ACCESS_TOKEN_SELF_CONTAINED: bool = False
+    # Tokens ya verificados (digest -> payload) que se reutilizan hasta su `exp`
+    TOKEN_CACHE_SIZE: int = 10000
+    # Refresh tokens revocados (filtro de Bloom en memoria + tabla revoked_tokens)
+    REFRESH_TOKEN_FILTER_CAPACITY: int = 100000
+    REFRESH_TOKEN_FILTER_ERROR_RATE: float = 0.01
+    REVOKED_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+    REVOKED_TOKEN_PURGE_BATCH_SIZE: int = 1000
+
+    # Password hashing (bcrypt se ejecuta fuera del event loop)
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    # Coste de bcrypt fijo (mínimo 10; `python -m app.cli calibrate-bcrypt` lo
+    # calcula para la máquina), o calibrado al arrancar para un verify de ~N ms.
+    # La calibración al arrancar solo se hace con WEB_CONCURRENCY=1: procesos con
+    # costes distintos regenerarían el hash del mismo usuario en cada login
+    BCRYPT_ROUNDS: Optional[int] = Field(None, ge=10)
+    BCRYPT_TARGET_VERIFY_MS: Optional[float] = None
+
+    # Throttling de login (token bucket por cuenta y por IP)
+    LOGIN_THROTTLE_ENABLED: bool = True
+    LOGIN_THROTTLE_MAX_KEYS: int = 100000
+    LOGIN_ACCOUNT_BURST: int = 5
+    LOGIN_ACCOUNT_PER_MINUTE: float = 5
+    LOGIN_IP_BURST: int = 20
+    LOGIN_IP_PER_MINUTE: float = 30
+    # Proxies de confianza (IPs o redes CIDR). Si la petición llega de uno de
+    # ellos, la IP del cliente se toma de X-Forwarded-For
+    TRUSTED_PROXIES: List[str] = []
+
+    # Cache de propiedad (board_id -> owner_id, list_id -> board_id), local a
+    # cada proceso: un borrado en otro proceso se ve como mucho tras el TTL
+    OWNERSHIP_CACHE_SIZE: int = 50000
+    OWNERSHIP_CACHE_TTL_SECONDS: int = 60
+
+    # Tamaño de página de tareas: por defecto y máximo que acepta el servidor
+    TASK_PAGE_SIZE: int = 100
+    TASK_PAGE_SIZE_MAX: int = 500
+    # Compactación de las listas con ranks más largos que esto. El servidor
+    # solo la hace periódicamente con WEB_CONCURRENCY=1; con más procesos se
+    # programa fuera (python -m app.cli compact-ranks) para no repetirla en
+    # cada uno
+    TASK_RANK_COMPACT_LENGTH: int = 16
+    TASK_RANK_COMPACT_INTERVAL_SECONDS: int = 600
+    TASK_RANK_COMPACT_BATCH_SIZE: int = 1000
+
+    # Máximo de tareas por petición en POST /tasks/bulk
+    TASK_BULK_MAX: int = 500
+
+    # Cabeceras X-Authz-Queries / X-Authz-Saved con las consultas de permisos
+    AUTHZ_DEBUG_HEADERS: bool = False
+
+    # Cache de usuarios autenticados (get_current_user), local a cada proceso:
+    # un usuario desactivado o borrado sigue autenticado en los demás procesos
+    # hasta que expira su entrada. Sin valor explícito el TTL es 60 s con
+    # WEB_CONCURRENCY=1 y 0 (cache desactivada) con varios procesos
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: Optional[int] = None
+
+    @model_validator(mode="after")
+    def self_contained_single_process(self) -> "Settings":
+        if self.ACCESS_TOKEN_SELF_CONTAINED and self.WEB_CONCURRENCY > 1:
+            raise ValueError(
+                "ACCESS_TOKEN_SELF_CONTAINED requires WEB_CONCURRENCY=1: token "
+                "revocations are only recorded in the worker that makes them"
+            )
+        return self
+
+    @model_validator(mode="after")
+    def principal_cache_single_process(self) -> "Settings":
+        if self.PRINCIPAL_CACHE_TTL_SECONDS is None:
+            self.PRINCIPAL_CACHE_TTL_SECONDS = 60 if self.WEB_CONCURRENCY == 1 else 0
+        elif self.PRINCIPAL_CACHE_TTL_SECONDS > 0 and self.WEB_CONCURRENCY > 1:
+            raise ValueError(
+                "PRINCIPAL_CACHE_TTL_SECONDS requires WEB_CONCURRENCY=1: user "
+                "updates only invalidate the cache of the worker that makes them"
+            )
+        return self
 
     model_config = SettingsConfigDict(
         env_file=".env",
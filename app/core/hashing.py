@@ -0,0 +1,83 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from .config import settings
+from .exceptions import ServiceUnavailableException
+
+T = TypeVar("T")
+
+
+class PasswordHashExecutor:
+    """
+    Pool acotado de hilos para bcrypt.
+
+    bcrypt libera el GIL, así que ejecutarlo en hilos deja el event loop
+    libre para atender otras peticiones. Cuando hay más trabajos en vuelo
+    que `max_workers + queue_limit` se rechaza la petición con un 503 en
+    lugar de encolarla indefinidamente.
+    """
+
+    def __init__(self, max_workers: int, queue_limit: int):
+        self.max_workers = max_workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self._in_flight - self.max_workers)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="password-hash"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._in_flight >= self.max_workers + self.queue_limit:
+            self._rejected += 1
+            raise ServiceUnavailableException("Authentication service busy, try again later")
+
+        self._in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), partial(func, *args))
+        finally:
+            self._in_flight -= 1
+            latency = time.perf_counter() - start
+            self._completed += 1
+            self._total_latency += latency
+            self._max_latency = max(self._max_latency, latency)
+
+    def stats(self) -> Dict[str, Any]:
+        avg = self._total_latency / self._completed if self._completed else 0.0
+        return {
+            "workers": self.max_workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self._in_flight,
+            "queue_depth": self.queue_depth,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "avg_latency_ms": round(avg * 1000, 3),
+            "max_latency_ms": round(self._max_latency * 1000, 3),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+
+password_hasher = PasswordHashExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
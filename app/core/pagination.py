@@ -0,0 +1,56 @@
+import base64
+import json
+from typing import Any, Optional, Sequence, Tuple
+
+from fastapi import Response
+
+from .exceptions import BadRequestException
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+
+def encode_cursor(*values: Any) -> str:
+    """Cursor opaco con los valores de la clave de orden de la última fila"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types: type) -> Tuple[Any, ...]:
+    """
+    Valores de un cursor generado por encode_cursor, uno por cada tipo de
+    `types` (los de la clave de orden). Un valor de otro tipo es un cursor
+    inválido: no debe llegar a la consulta.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise BadRequestException("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise BadRequestException("Invalid cursor")
+    if not all(
+            isinstance(value, type_) and not isinstance(value, bool)
+            for value, type_ in zip(values, types)
+    ):
+        raise BadRequestException("Invalid cursor")
+    return tuple(values)
+
+
+def next_cursor(rows: Sequence[Any], limit: Optional[int], *key: str) -> Optional[str]:
+    """Cursor de la página siguiente si la página está llena, o None"""
+    if limit is None or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(getattr(last, k) for k in key))
+
+
+def set_next_cursor(
+        response: Response, rows: Sequence[Any], limit: Optional[int], *key: str
+) -> None:
+    """
+    Añade X-Next-Cursor si la página está llena, con la clave de la última fila.
+    """
+    cursor = next_cursor(rows, limit, *key)
+    if cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
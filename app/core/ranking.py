@@ -0,0 +1,70 @@
+"""
+Claves de orden fraccionarias (rank) en base 36.
+
+Una clave "d1d2...dn" representa la fracción 0.d1d2...dn, de modo que el
+orden lexicográfico coincide con el numérico y siempre existe una clave
+entre dos distintas. Las claves nunca terminan en "0", así que también
+hay siempre una clave antes de cualquier otra.
+"""
+from typing import Optional
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+BASE = len(DIGITS)
+RANK_DEFAULT = DIGITS[BASE // 2]
+# Longitud de la columna; una clave más larga obliga a compactar
+RANK_MAX_LENGTH = 64
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """Clave estrictamente entre `a` ("" = 0) y `b` (None = 1)"""
+    if b is not None:
+        # Prefijo común: la clave buscada también lo tiene
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else BASE
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b) // 2]
+    # Dígitos consecutivos
+    if b is not None and len(b) > 1:
+        return b[0]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _validate(key: Optional[str]) -> None:
+    if key is not None and (not key or key.endswith("0") or key.strip(DIGITS)):
+        raise ValueError(f"Invalid rank {key!r}")
+
+
+def rank_between(before: Optional[str], after: Optional[str]) -> str:
+    """
+    Clave que ordena después de `before` y antes de `after`. Cualquiera de
+    los dos puede ser None (principio o final).
+    """
+    if before is not None and after is not None and before >= after:
+        raise ValueError(f"{before!r} must sort before {after!r}")
+    _validate(before)
+    _validate(after)
+    return _midpoint(before or "", after)
+
+
+def rank_after(before: Optional[str]) -> str:
+    """
+    Clave para añadir al final, después de `before` (RANK_DEFAULT si es None).
+
+    Incrementa el primer dígito que no es el último y descarta el resto, así
+    que las claves solo crecen un carácter cada ~35 inserciones al final, en
+    lugar de cada pocas como con rank_between(before, None).
+    """
+    if before is None:
+        return RANK_DEFAULT
+    _validate(before)
+    for index, digit in enumerate(before):
+        if digit != DIGITS[-1]:
+            return before[:index] + DIGITS[DIGITS.index(digit) + 1]
+    return before + DIGITS[1]
+
@@ -1,13 +1,67 @@
+import sys
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional, Tuple
 
-from jose import jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 
+try:
+    import jwt as pyjwt
+except ImportError:  # PyJWT es opcional
+    pyjwt = None
+
 from .config import settings
+from .hashing import password_hasher
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+
+
+def configure_bcrypt_rounds(rounds: int) -> None:
+    """
+    Fijar el coste de bcrypt.
+
+    Los hashes con otro coste (mayor o menor) pasan a necesitar
+    actualización y se regeneran en el siguiente login correcto.
+    Nunca por debajo de BCRYPT_MIN_ROUNDS.
+    """
+    if rounds < BCRYPT_MIN_ROUNDS:
+        raise ValueError(f"bcrypt rounds must be at least {BCRYPT_MIN_ROUNDS}, got {rounds}")
+    pwd_context.update(
+        bcrypt__default_rounds=rounds,
+        bcrypt__min_rounds=rounds,
+        bcrypt__max_rounds=rounds,
+    )
+
+
+def calibrate_bcrypt_rounds(
+        target_ms: float,
+        min_rounds: int = BCRYPT_MIN_ROUNDS,
+        max_rounds: int = BCRYPT_MAX_ROUNDS,
+) -> int:
+    """Mayor coste de bcrypt cuyo verify tarda como mucho target_ms en esta máquina"""
+    handler = pwd_context.handler("bcrypt")
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        hashed = handler.using(rounds=rounds).hash("calibration-password")
+        start = time.perf_counter()
+        handler.verify("calibration-password", hashed)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms > target_ms and rounds > min_rounds:
+            break
+        chosen = rounds
+    return chosen
+
+
+if settings.BCRYPT_ROUNDS:
+    configure_bcrypt_rounds(settings.BCRYPT_ROUNDS)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
@@ -17,6 +71,210 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Igual que verify_password pero sin bloquear el event loop"""
+    return await password_hasher.run(verify_password, plain_password, hashed_password)
+
+
+async def verify_and_update_password_async(
+        plain_password: str, hashed_password: str
+) -> Tuple[bool, Optional[str]]:
+    """
+    Verificar el password y, si el hash usa un coste distinto al configurado,
+    retornar también el hash regenerado
+    """
+    return await password_hasher.run(pwd_context.verify_and_update, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Igual que get_password_hash pero sin bloquear el event loop"""
+    return await password_hasher.run(get_password_hash, password)
+
+
+def access_token_claims(user: Any) -> Dict[str, Any]:
+    """
+    Claims del access token para un usuario.
+
+    Con ACCESS_TOKEN_SELF_CONTAINED se añaden el estado, el username y la
+    versión de token para que las peticiones se autoricen sin leer la BD.
+    """
+    claims: Dict[str, Any] = {"sub": str(user.id)}
+    if settings.ACCESS_TOKEN_SELF_CONTAINED:
+        claims.update({
+            "act": bool(user.is_active),
+            "usr": user.username,
+            "ver": user.token_version or 0,
+        })
+    return claims
+
+
+class AccessTokenRevocations:
+    """
+    Versión mínima de token aceptada por usuario.
+
+    Solo guarda los usuarios cuyos tokens se revocaron recientemente: pasado
+    el tiempo de vida de un access token, todos los tokens anteriores a la
+    revocación ya han expirado y la entrada se puede descartar.
+    El registro es local al proceso; se alimenta de los cambios en `users`
+    hechos a través del ORM. Otros procesos seguirían aceptando los tokens
+    revocados hasta su `exp`, por eso Settings rechaza los tokens
+    autocontenidos con más de un proceso.
+    """
+
+    REVOKE_ALL = sys.maxsize
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def revoke(self, user_id: int, min_version: int) -> None:
+        self._purge()
+        self._entries[user_id] = (min_version, time.monotonic())
+        self._entries.move_to_end(user_id)
+
+    def is_revoked(self, user_id: int, version: int) -> bool:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return False
+        min_version, recorded_at = entry
+        if recorded_at + self.ttl <= time.monotonic():
+            del self._entries[user_id]
+            return False
+        return version < min_version
+
+    def _purge(self) -> None:
+        deadline = time.monotonic() - self.ttl
+        while self._entries:
+            user_id, (_, recorded_at) = next(iter(self._entries.items()))
+            if recorded_at > deadline:
+                break
+            del self._entries[user_id]
+
+
+access_token_revocations = AccessTokenRevocations(
+    ttl=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+)
+
+
+SYMMETRIC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+
+
+class TokenError(Exception):
+    """Token mal formado, con firma inválida o expirado"""
+
+
+class TokenCodec(ABC):
+    """
+    Firma y verificación de JWT con las claves ya preparadas.
+
+    Con algoritmos simétricos (HS*) se usa SECRET_KEY para ambas operaciones.
+    Con algoritmos asimétricos (ES256, EdDSA, RS256...) basta la clave pública
+    para verificar, así que otros servicios pueden validar los tokens sin
+    poder emitirlos.
+    """
+
+    name: str
+
+    def __init__(self, algorithm: str, signing_key: Optional[str], verification_key: str):
+        self.algorithm = algorithm
+        self._signing_key = self._prepare_key(signing_key) if signing_key else None
+        self._verification_key = self._prepare_key(verification_key)
+
+    @abstractmethod
+    def _prepare_key(self, key: str) -> Any:
+        ...
+
+    @abstractmethod
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        ...
+
+    @abstractmethod
+    def _decode(self, token: str) -> Dict[str, Any]:
+        ...
+
+    def encode(self, claims: Dict[str, Any]) -> str:
+        if self._signing_key is None:
+            raise RuntimeError("No signing key configured for this token codec")
+        return self._encode(claims)
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        return self._decode(token)
+
+
+class JoseTokenCodec(TokenCodec):
+    name = "jose"
+
+    def _prepare_key(self, key: str) -> Any:
+        return jwk.construct(key, self.algorithm)
+
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        return jwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return jwt.decode(token, self._verification_key, algorithms=[self.algorithm])
+        except JWTError as e:
+            raise TokenError(str(e)) from e
+
+
+class PyJWTTokenCodec(TokenCodec):
+    name = "pyjwt"
+
+    def __init__(self, algorithm: str, signing_key: Optional[str], verification_key: str):
+        if pyjwt is None:
+            raise RuntimeError("TOKEN_BACKEND=pyjwt requires the PyJWT package")
+        self._algorithm_impl = pyjwt.get_algorithm_by_name(algorithm)
+        super().__init__(algorithm, signing_key, verification_key)
+
+    def _prepare_key(self, key: str) -> Any:
+        return self._algorithm_impl.prepare_key(key)
+
+    def _encode(self, claims: Dict[str, Any]) -> str:
+        return pyjwt.encode(claims, self._signing_key, algorithm=self.algorithm)
+
+    def _decode(self, token: str) -> Dict[str, Any]:
+        try:
+            return pyjwt.decode(token, self._verification_key, algorithms=[self.algorithm])
+        except pyjwt.PyJWTError as e:
+            raise TokenError(str(e)) from e
+
+
+TOKEN_CODECS = {
+    JoseTokenCodec.name: JoseTokenCodec,
+    PyJWTTokenCodec.name: PyJWTTokenCodec,
+}
+
+
+def build_token_codec(
+        backend: str,
+        algorithm: str,
+        secret_key: Optional[str] = None,
+        private_key: Optional[str] = None,
+        public_key: Optional[str] = None,
+) -> TokenCodec:
+    if backend not in TOKEN_CODECS:
+        raise ValueError(f"Unknown token backend: {backend}")
+    if algorithm in SYMMETRIC_ALGORITHMS:
+        signing_key, verification_key = secret_key, secret_key
+    else:
+        if not public_key:
+            raise ValueError(f"{algorithm} requires TOKEN_PUBLIC_KEY")
+        signing_key, verification_key = private_key, public_key
+    return TOKEN_CODECS[backend](algorithm, signing_key, verification_key)
+
+
+token_codec = build_token_codec(
+    settings.TOKEN_BACKEND,
+    settings.ALGORITHM,
+    secret_key=settings.SECRET_KEY,
+    private_key=settings.TOKEN_PRIVATE_KEY,
+    public_key=settings.TOKEN_PUBLIC_KEY,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -26,16 +284,12 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    encoded_jwt = token_codec.encode(to_encode)
     return encoded_jwt
 
 
 def create_refresh_token(data: dict):
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
-    return jwt.encode(
-        to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM
-    )
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
+    return token_codec.encode(to_encode)
@@ -0,0 +1,160 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .config import settings
+from .exceptions import TooManyRequestsException
+
+# (tokens disponibles, instante de la última actualización)
+BucketState = Tuple[float, float]
+
+
+class ThrottleBackend(ABC):
+    """Almacén del estado de los buckets"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[BucketState]:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, state: BucketState) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+
+class InMemoryThrottleBackend(ThrottleBackend):
+    """
+    Backend local al proceso con un número máximo de claves.
+
+    Al superar `max_keys` se descarta el bucket usado hace más tiempo, que
+    es también el que más tokens habrá recuperado.
+    """
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, BucketState]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def get(self, key: str) -> Optional[BucketState]:
+        return self._buckets.get(key)
+
+    def set(self, key: str, state: BucketState) -> None:
+        self._buckets[key] = state
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+    def clear(self) -> None:
+        self._buckets.clear()
+
+
+class TokenBucket:
+    def __init__(self, backend: ThrottleBackend, prefix: str, capacity: int, per_minute: float):
+        self.backend = backend
+        self.prefix = prefix
+        self.capacity = capacity
+        self.rate = per_minute / 60
+
+    def _tokens(self, key: str, now: float) -> float:
+        state = self.backend.get(self.prefix + key)
+        if state is None:
+            return float(self.capacity)
+        tokens, updated_at = state
+        return min(float(self.capacity), tokens + (now - updated_at) * self.rate)
+
+    def retry_after(self, key: str, now: float) -> Optional[int]:
+        """Segundos hasta que haya un token disponible, o None si ya lo hay"""
+        tokens = self._tokens(key, now)
+        if tokens >= 1:
+            return None
+        if self.rate <= 0:
+            return 60
+        return max(1, math.ceil((1 - tokens) / self.rate))
+
+    def add(self, key: str, amount: float, now: float) -> None:
+        tokens = min(float(self.capacity), self._tokens(key, now) + amount)
+        self.backend.set(self.prefix + key, (tokens, now))
+
+
+class LoginThrottle:
+    """
+    Throttling de intentos de login por cuenta y por IP.
+
+    Cada intento consume un token de ambos buckets antes de verificar el
+    password; si la verificación tiene éxito, o no llega a hacerse porque el
+    servidor está saturado, el token se devuelve, así que en la práctica solo
+    cuentan los intentos fallidos. Un intento sin tokens se
+    rechaza sin llegar a ejecutar bcrypt.
+    """
+
+    def __init__(
+            self,
+            backend: ThrottleBackend,
+            *,
+            account_burst: int,
+            account_per_minute: float,
+            ip_burst: int,
+            ip_per_minute: float,
+            enabled: bool = True,
+    ):
+        self.backend = backend
+        self.enabled = enabled
+        self.accounts = TokenBucket(backend, "account:", account_burst, account_per_minute)
+        self.ips = TokenBucket(backend, "ip:", ip_burst, ip_per_minute)
+        self.throttled = 0
+        self.verified = 0
+
+    def acquire(self, account: str, client_ip: str) -> None:
+        """Consume un intento o lanza TooManyRequestsException"""
+        if not self.enabled:
+            self.verified += 1
+            return
+
+        account = account.lower()
+        now = time.monotonic()
+        retry_after = max(
+            self.accounts.retry_after(account, now) or 0,
+            self.ips.retry_after(client_ip, now) or 0,
+        )
+        if retry_after:
+            self.throttled += 1
+            raise TooManyRequestsException("Too many login attempts", retry_after=retry_after)
+
+        self.accounts.add(account, -1, now)
+        self.ips.add(client_ip, -1, now)
+        self.verified += 1
+
+    def refund(self, account: str, client_ip: str) -> None:
+        """Devuelve el token consumido por un login correcto o no verificado"""
+        if not self.enabled:
+            return
+        now = time.monotonic()
+        self.accounts.add(account.lower(), 1, now)
+        self.ips.add(client_ip, 1, now)
+
+    def reset(self) -> None:
+        self.backend.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "throttled": self.throttled,
+            "verified": self.verified,
+        }
+
+
+login_throttle = LoginThrottle(
+    InMemoryThrottleBackend(max_keys=settings.LOGIN_THROTTLE_MAX_KEYS),
+    account_burst=settings.LOGIN_ACCOUNT_BURST,
+    account_per_minute=settings.LOGIN_ACCOUNT_PER_MINUTE,
+    ip_burst=settings.LOGIN_IP_BURST,
+    ip_per_minute=settings.LOGIN_IP_PER_MINUTE,
+    enabled=settings.LOGIN_THROTTLE_ENABLED,
+)
@@ -1,8 +1,10 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from functools import cached_property
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
-from sqlalchemy import select, func
+from sqlalchemy import Select, case, inspect, select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -13,15 +15,57 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
+    @cached_property
+    def deferred_columns(self) -> List[Any]:
+        """Columnas diferidas por defecto en el modelo (p. ej. descripciones)"""
+        return [
+            getattr(self.model, attr.key)
+            for attr in inspect(self.model).column_attrs
+            if attr.deferred
+        ]
+
+    @cached_property
+    def column_keys(self) -> frozenset:
+        """Atributos del modelo mapeados a columnas"""
+        return frozenset(attr.key for attr in inspect(self.model).column_attrs)
+
+    def _apply_changes(self, db_obj: ModelType, update_data: Dict[str, Any]) -> bool:
+        """
+        Asigna a `db_obj` solo las columnas cuyo valor cambia. Retorna False
+        si ninguna cambia. Las columnas no cargadas se asignan sin comparar.
+        """
+        loaded = inspect(db_obj).dict
+        changed = False
+        for field, value in update_data.items():
+            if field not in self.column_keys:
+                continue
+            if field in loaded and loaded[field] == value:
+                continue
+            setattr(db_obj, field, value)
+            changed = True
+        return changed
+
+    def _load_only(self, query: Select, fields: Optional[Sequence[str]], *always: str) -> Select:
+        """
+        Carga solo las columnas `fields` (y `always`); el resto queda diferido.
+        Sin `fields` carga todas, incluidas las diferidas por defecto.
+        """
+        if not fields:
+            return query.options(*(undefer(column) for column in self.deferred_columns))
+        names = dict.fromkeys([*fields, *always])
+        return query.options(load_only(*(getattr(self.model, name) for name in names)))
+
     async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
-        result = await db.execute(select(self.model).filter(self.model.id == id))
+        result = await db.execute(
+            self._load_only(select(self.model), None).filter(self.model.id == id)
+        )
         return result.scalars().first()
 
     async def get_multi(
             self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> List[ModelType]:
         result = await db.execute(
-            select(self.model).offset(skip).limit(limit)
+            self._load_only(select(self.model), None).offset(skip).limit(limit)
         )
         return result.scalars().all()
 
@@ -34,7 +78,6 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db_obj = self.model(**obj_in_data)
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def update(
@@ -44,19 +87,20 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db_obj: ModelType,
             obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
-        obj_data = jsonable_encoder(db_obj)
+        """
+        Actualiza solo las columnas que cambian. Si ninguna cambia no se
+        escribe nada (ni se modifica updated_at).
+        """
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
             update_data = obj_in.model_dump(exclude_unset=True)
 
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        if not self._apply_changes(db_obj, update_data):
+            return db_obj
 
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
@@ -65,3 +109,42 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await db.commit()
         return obj
 
+    async def reorder(
+            self,
+            db: AsyncSession,
+            *,
+            ids: Sequence[int],
+            parent: str,
+            parent_id: int,
+            batch_size: int = 1000,
+    ) -> bool:
+        """
+        Asigna position = índice en `ids` con un UPDATE ... CASE por cada
+        `batch_size` ids, en una sola transacción. `ids` debe contener
+        exactamente todos los hijos de `parent_id`: si falta alguno quedaría
+        con su posición antigua, repetida. Retorna False, sin aplicar nada,
+        en otro caso.
+        """
+        parent_column = getattr(self.model, parent)
+        total = await db.scalar(
+            select(func.count()).select_from(self.model).filter(parent_column == parent_id)
+        )
+        if total != len(ids):
+            return False
+        updated = 0
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            result = await db.execute(
+                update(self.model)
+                .where(parent_column == parent_id, self.model.id.in_(chunk))
+                .values(position=case(
+                    {id: start + index for index, id in enumerate(chunk)}, value=self.model.id
+                ))
+                .execution_options(synchronize_session="fetch")
+            )
+            updated += result.rowcount
+        if updated != len(ids):
+            await db.rollback()
+            return False
+        await db.commit()
+        return True
@@ -1,32 +1,80 @@
-from typing import List
-from sqlalchemy import select
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.crud.base import CRUDBase
+from app.crud.task import task as task_crud
 from app.db.models.board import Board
+from app.db.models.task import Task
 from app.schemas.board import BoardCreate, BoardUpdate
 
+# owner_id de cada tablero; no cambia tras create_with_owner
+board_owner_cache: TTLCache[int] = TTLCache(
+    maxsize=settings.OWNERSHIP_CACHE_SIZE,
+    ttl=settings.OWNERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(Board, "after_delete")
+def _evict_board_owner(mapper, connection, target: Board) -> None:
+    board_owner_cache.pop(target.id)
+
 
 class CRUDBoard(CRUDBase[Board, BoardCreate, BoardUpdate]):
     async def get_by_owner(
-            self, db: AsyncSession, *, owner_id: int, skip: int = 0, limit: int = 100
+            self,
+            db: AsyncSession,
+            *,
+            owner_id: int,
+            skip: int = 0,
+            limit: int = 100,
+            after: Optional[Tuple[int]] = None,
+            fields: Optional[Sequence[str]] = None,
     ) -> List[Board]:
-        result = await db.execute(
-            select(Board)
-            .filter(Board.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-        )
+        """
+        Tableros del usuario ordenados por id. Con `after` (el id del último
+        tablero de la página anterior) se pagina por clave en lugar de OFFSET.
+        Con `fields` solo se cargan esas columnas.
+        """
+        query = self._load_only(select(Board), fields).filter(Board.owner_id == owner_id)
+        if after is not None:
+            query = query.filter(Board.id > after[0])
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query.order_by(Board.id).limit(limit))
         return result.scalars().all()
 
+    async def get_owner_id(self, db: AsyncSession, *, id: int) -> Optional[int]:
+        """owner_id del tablero, o None si no existe"""
+        result = await db.execute(select(Board.owner_id).filter(Board.id == id))
+        return result.scalar()
+
     async def get_with_lists(self, db: AsyncSession, *, id: int) -> Board:
         result = await db.execute(
-            select(Board)
+            self._load_only(select(Board), None)
             .options(selectinload(Board.lists))
             .filter(Board.id == id)
         )
         return result.scalars().first()
 
+    async def get_full(
+            self, db: AsyncSession, *, id: int, tasks_limit: int
+    ) -> Optional[Tuple[Board, Dict[int, List[Task]]]]:
+        """
+        Tablero con sus listas, y las primeras `tasks_limit` tareas de cada
+        lista (por list_id), ya ordenadas. Son tres consultas sin importar
+        cuántas listas tenga.
+        """
+        board = await self.get_with_lists(db, id=id)
+        if board is None:
+            return None
+        tasks = await task_crud.get_first_by_lists(
+            db, list_ids=[list_obj.id for list_obj in board.lists], limit=tasks_limit
+        )
+        return board, tasks
+
     async def create_with_owner(
             self, db: AsyncSession, *, obj_in: BoardCreate, owner_id: int
     ) -> Board:
@@ -36,7 +84,7 @@ class CRUDBoard(CRUDBase[Board, BoardCreate, BoardUpdate]):
         )
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        board_owner_cache.set(db_obj.id, owner_id)
         return db_obj
 
 
@@ -0,0 +1,98 @@
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.models.board import Board
+from app.db.models.list import List
+from app.db.models.task import Task, TaskPriority
+
+COUNTER_COLUMNS = ("task_count",) + tuple(f"{p.value}_count" for p in TaskPriority)
+
+
+def counter_column(priority: Optional[TaskPriority]) -> str:
+    """Columna del contador de una prioridad (sin prioridad cuenta como media)"""
+    return f"{TaskPriority(priority or TaskPriority.MEDIUM).value}_count"
+
+
+def _increments(model, deltas: Dict[TaskPriority, int]) -> Dict[str, Any]:
+    values: Dict[str, int] = {}
+    for priority, delta in deltas.items():
+        name = counter_column(priority)
+        values[name] = values.get(name, 0) + delta
+        values["task_count"] = values.get("task_count", 0) + delta
+    return {
+        name: getattr(model, name) + delta
+        for name, delta in values.items()
+        if delta
+    }
+
+
+async def adjust_task_counters(
+        db: AsyncSession, *, list_id: int, deltas: Dict[TaskPriority, int]
+) -> None:
+    """
+    Suma `deltas` (tareas por prioridad) a los contadores de la lista y de
+    su tablero. No hace commit: va en la transacción del cambio de tareas.
+    """
+    values = _increments(List, deltas)
+    if not values:
+        return
+    result = await db.execute(
+        update(List).where(List.id == list_id).values(**values).returning(List.board_id)
+    )
+    board_id = result.scalar()
+    if board_id is not None:
+        await db.execute(
+            update(Board).where(Board.id == board_id).values(**_increments(Board, deltas))
+        )
+
+
+async def release_list_counters(db: AsyncSession, *, list_id: int) -> None:
+    """Resta del tablero los contadores de una lista que se va a eliminar"""
+    await db.execute(
+        update(Board)
+        .where(Board.id == select(List.board_id).where(List.id == list_id).scalar_subquery())
+        .values(**{
+            name: getattr(Board, name)
+            - select(getattr(List, name)).where(List.id == list_id).scalar_subquery()
+            for name in COUNTER_COLUMNS
+        })
+    )
+
+
+async def repair_task_counters(db: AsyncSession) -> Tuple[int, int]:
+    """
+    Recalcula en bloque los contadores de todas las listas y tableros a
+    partir de la tabla de tareas. Retorna (listas, tableros) actualizados.
+    """
+
+    def task_count(*criteria):
+        return (
+            select(func.count(Task.id))
+            .where(Task.list_id == List.id, *criteria)
+            .scalar_subquery()
+        )
+
+    list_values = {"task_count": task_count()}
+    for priority in TaskPriority:
+        criteria = Task.priority == priority
+        if priority == TaskPriority.MEDIUM:
+            criteria = or_(criteria, Task.priority.is_(None))
+        list_values[counter_column(priority)] = task_count(criteria)
+
+    lists = await db.execute(
+        update(List).values(**list_values).execution_options(synchronize_session=False)
+    )
+    boards = await db.execute(
+        update(Board)
+        .values(**{
+            name: select(func.coalesce(func.sum(getattr(List, name)), 0))
+            .where(List.board_id == Board.id)
+            .scalar_subquery()
+            for name in COUNTER_COLUMNS
+        })
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+    return lists.rowcount, boards.rowcount
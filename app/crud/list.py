@@ -1,30 +1,57 @@
-from typing import List as TypingList
-from sqlalchemy import select
+from typing import List as TypingList, Optional, Sequence, Tuple
+from sqlalchemy import event, inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.crud.base import CRUDBase
+from app.crud.counters import release_list_counters
+from app.db.models.board import Board
 from app.db.models.list import List
 from app.schemas.list import ListCreate, ListUpdate
 
+# board_id de cada lista
+list_board_cache: TTLCache[int] = TTLCache(
+    maxsize=settings.OWNERSHIP_CACHE_SIZE,
+    ttl=settings.OWNERSHIP_CACHE_TTL_SECONDS,
+)
+
+
+@event.listens_for(List, "after_delete")
+def _evict_list_board(mapper, connection, target: List) -> None:
+    list_board_cache.pop(target.id)
+
+
+@event.listens_for(List, "after_update")
+def _evict_moved_list(mapper, connection, target: List) -> None:
+    if inspect(target).attrs.board_id.history.has_changes():
+        list_board_cache.pop(target.id)
+
 
 class CRUDList(CRUDBase[List, ListCreate, ListUpdate]):
     async def get_by_board(
-            self, db: AsyncSession, *, board_id: int
+            self, db: AsyncSession, *, board_id: int, fields: Optional[Sequence[str]] = None
     ) -> TypingList[List]:
         result = await db.execute(
-            select(List)
+            self._load_only(select(List), fields)
             .filter(List.board_id == board_id)
-            .order_by(List.position)
+            .order_by(List.position, List.id)
         )
         return result.scalars().all()
 
-    async def get_with_tasks(self, db: AsyncSession, *, id: int) -> List:
-        result = await db.execute(
-            select(List)
-            .options(selectinload(List.tasks))
+    async def get_with_owner(self, db: AsyncSession, *, id: int) -> Optional[Tuple[List, int]]:
+        """La lista junto con el owner_id de su tablero, en una sola consulta"""
+        query = (
+            select(List, Board.owner_id)
+            .join(Board, List.board_id == Board.id)
             .filter(List.id == id)
         )
-        return result.scalars().first()
+        result = await db.execute(query)
+        return result.first()
+
+    async def remove(self, db: AsyncSession, *, id: int) -> List:
+        """Eliminar la lista y descontar sus tareas de los contadores del tablero"""
+        await release_list_counters(db, list_id=id)
+        return await super().remove(db, id=id)
 
 
 list_crud = CRUDList(List)
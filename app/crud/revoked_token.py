@@ -0,0 +1,97 @@
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import BloomFilter
+from app.core.config import settings
+from app.db.models.revoked_token import RevokedToken
+
+
+def _new_filter() -> BloomFilter:
+    return BloomFilter(
+        capacity=settings.REFRESH_TOKEN_FILTER_CAPACITY,
+        error_rate=settings.REFRESH_TOKEN_FILTER_ERROR_RATE,
+    )
+
+
+class CRUDRevokedToken:
+    """
+    Lista de refresh tokens revocados (por jti).
+
+    Un filtro de Bloom en memoria evita consultar la tabla para los tokens
+    que nunca se revocaron en este proceso; solo los probables positivos
+    llegan a la base de datos. La inserción en `revoke` es la comprobación
+    definitiva, de modo que dos procesos no pueden aceptar el mismo token.
+    """
+
+    def __init__(self):
+        self.filter = _new_filter()
+        self.filter_hits = 0
+        self.filter_misses = 0
+
+    async def is_revoked(self, db: AsyncSession, *, jti: str) -> bool:
+        if not self.filter.might_contain(jti):
+            self.filter_misses += 1
+            return False
+
+        self.filter_hits += 1
+        result = await db.execute(
+            select(RevokedToken.jti).filter(RevokedToken.jti == jti)
+        )
+        return result.scalar() is not None
+
+    async def revoke(self, db: AsyncSession, *, jti: str, expires_at: datetime) -> bool:
+        """Revoca el token. Retorna False si ya estaba revocado"""
+        db.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return False
+        finally:
+            self.filter.add(jti)
+        return True
+
+    async def load_filter(self, db: AsyncSession) -> int:
+        """Reconstruye el filtro con los tokens revocados que siguen vigentes"""
+        result = await db.execute(
+            select(RevokedToken.jti).filter(RevokedToken.expires_at >= datetime.utcnow())
+        )
+        new_filter = _new_filter()
+        for jti in result.scalars():
+            new_filter.add(jti)
+        self.filter = new_filter
+        return new_filter.count
+
+    async def purge_expired(
+            self, db: AsyncSession, *, batch_size: int, now: Optional[datetime] = None
+    ) -> int:
+        """Borra en lotes las filas de tokens que ya expiraron"""
+        now = now or datetime.utcnow()
+        purged = 0
+        while True:
+            expired = (
+                select(RevokedToken.jti)
+                .filter(RevokedToken.expires_at < now)
+                .limit(batch_size)
+            )
+            result = await db.execute(
+                delete(RevokedToken).where(RevokedToken.jti.in_(expired))
+            )
+            await db.commit()
+            purged += result.rowcount
+            if result.rowcount < batch_size:
+                return purged
+
+    def stats(self):
+        return {
+            "filter_items": self.filter.count,
+            "filter_hits": self.filter_hits,
+            "filter_misses": self.filter_misses,
+        }
+
+
+revoked_token = CRUDRevokedToken()
@@ -1,32 +1,359 @@
-from typing import List as TypingList
+from collections import Counter, defaultdict
+from typing import Any, Dict, List as TypingList, Optional, Sequence, Tuple, Union
 
-from sqlalchemy import select
+from sqlalchemy import case, func, insert, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
 
+from app.core.ranking import RANK_DEFAULT, RANK_MAX_LENGTH, rank_after, rank_between
 from app.crud.base import CRUDBase
+from app.crud.counters import adjust_task_counters, counter_column
+from app.db.models.board import Board
+from app.db.models.list import List
 from app.db.models.task import Task
 from app.schemas.task import TaskCreate, TaskUpdate
 
+# Orden de las tareas dentro de una lista
+ORDER_KEY = (Task.position, Task.rank, Task.id)
+
 
 class CRUDTask(CRUDBase[Task, TaskCreate, TaskUpdate]):
-    async def get_by_list(self, db: AsyncSession, *, list_id: int) -> TypingList[Task]:
-        result = await db.execute(
-            select(Task)
+    """
+    Las operaciones que crean, borran, mueven o cambian la prioridad de una
+    tarea actualizan los contadores de su lista y tablero en la misma
+    transacción.
+    """
+
+    async def _append_ranks(
+            self, db: AsyncSession, rows: Sequence[Dict[str, Any]], *, exclude_id: Optional[int] = None
+    ) -> None:
+        """
+        Da a cada fila un rank después del último de su (list_id, position),
+        en el orden de `rows`, para que las tareas nuevas queden al final de
+        su posición con claves distintas y colocar otra entre ellas no obligue
+        a compactar. Si alguna clave no cabe se compactan sus listas, sin commit.
+        """
+        for attempt in range(2):
+            groups = list(dict.fromkeys((row["list_id"], row["position"]) for row in rows))
+            query = (
+                select(Task.list_id, Task.position, func.max(Task.rank))
+                .filter(tuple_(Task.list_id, Task.position).in_(groups))
+                .group_by(Task.list_id, Task.position)
+            )
+            if exclude_id is not None:
+                query = query.filter(Task.id != exclude_id)
+            last = {(list_id, position): rank for list_id, position, rank in await db.execute(query)}
+            for row in rows:
+                group = (row["list_id"], row["position"])
+                row["rank"] = last[group] = rank_after(last.get(group))
+
+            too_long = {row["list_id"] for row in rows if len(row["rank"]) > RANK_MAX_LENGTH}
+            if not too_long or attempt:
+                return
+            for list_id in too_long:
+                await self._compact(db, list_id=list_id)
+
+    async def create(self, db: AsyncSession, *, obj_in: TaskCreate) -> Task:
+        row = obj_in.model_dump()
+        await self._append_ranks(db, [row])
+        db_obj = Task(**row)
+        db.add(db_obj)
+        await adjust_task_counters(db, list_id=db_obj.list_id, deltas={db_obj.priority: 1})
+        await db.commit()
+        return db_obj
+
+    async def create_many(
+            self, db: AsyncSession, *, objs_in: Sequence[TaskCreate]
+    ) -> TypingList[Task]:
+        """
+        Crea todas las tareas con un INSERT multi-fila ... RETURNING en una
+        transacción, al final de su posición y en el orden dado. Retorna las tareas en el mismo orden que `objs_in`.
+        """
+        rows = [obj_in.model_dump() for obj_in in objs_in]
+        await self._append_ranks(db, rows)
+        # sort_by_parameter_order garantiza el orden de RETURNING, pero en
+        # SQLite obligaría a insertar fila a fila. SQLite ejecuta las filas de
+        # un INSERT en orden asignando rowid = max + 1, así que allí basta
+        # ordenar por id.
+        by_id = db.get_bind().dialect.name == "sqlite"
+        result = await db.scalars(
+            insert(Task)
+            .returning(Task, sort_by_parameter_order=not by_id)
+            .options(undefer(Task.description)),
+            rows,
+        )
+        tasks = result.all()
+        if by_id:
+            tasks = sorted(tasks, key=lambda task: task.id)
+
+        per_list: Dict[int, Counter] = defaultdict(Counter)
+        for row in rows:
+            per_list[row["list_id"]][row["priority"]] += 1
+        for list_id, deltas in per_list.items():
+            await adjust_task_counters(db, list_id=list_id, deltas=dict(deltas))
+        await db.commit()
+        return tasks
+
+    async def update(
+            self,
+            db: AsyncSession,
+            *,
+            db_obj: Task,
+            obj_in: Union[TaskUpdate, Dict[str, Any]]
+    ) -> Task:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+
+        if "priority" in update_data:
+            old, new = db_obj.priority, update_data["priority"]
+            if counter_column(old) != counter_column(new):
+                await adjust_task_counters(
+                    db, list_id=db_obj.list_id, deltas={old: -1, new: 1}
+                )
+        return await super().update(db, db_obj=db_obj, obj_in=update_data)
+
+    async def remove(self, db: AsyncSession, *, id: int) -> Task:
+        # db.get reutiliza la tarea si ya está en la sesión (p. ej. tras get_task)
+        obj = await db.get(Task, id)
+        await adjust_task_counters(db, list_id=obj.list_id, deltas={obj.priority: -1})
+        await db.delete(obj)
+        await db.commit()
+        return obj
+
+    async def get_by_list(
+            self,
+            db: AsyncSession,
+            *,
+            list_id: int,
+            limit: Optional[int] = None,
+            after: Optional[Tuple[int, str, int]] = None,
+            fields: Optional[Sequence[str]] = None,
+    ) -> TypingList[Task]:
+        """
+        Tareas de la lista ordenadas por (position, rank, id). `after` es la
+        clave de la última tarea de la página anterior. Con `fields` solo se
+        cargan esas columnas, más las que necesita el cursor.
+        """
+        query = (
+            self._load_only(select(Task), fields, "position", "rank")
             .filter(Task.list_id == list_id)
-            .order_by(Task.position)
         )
+        if after is not None:
+            query = query.filter(tuple_(*ORDER_KEY) > tuple_(*after))
+        query = query.order_by(*ORDER_KEY)
+        if limit is not None:
+            query = query.limit(limit)
+        result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_first_by_lists(
+            self, db: AsyncSession, *, list_ids: Sequence[int], limit: int
+    ) -> Dict[int, TypingList[Task]]:
+        """
+        Las primeras `limit` tareas de cada lista, en una sola consulta
+        (row_number() por lista). Cada lista trae sus tareas en orden.
+        """
+        if not list_ids:
+            return {}
+        ranked = (
+            select(
+                Task.id,
+                func.row_number()
+                .over(partition_by=Task.list_id, order_by=ORDER_KEY)
+                .label("row_number"),
+            )
+            .filter(Task.list_id.in_(list_ids))
+            .subquery()
+        )
+        result = await db.execute(
+            select(Task)
+            .options(undefer(Task.description))
+            .filter(Task.id.in_(select(ranked.c.id).filter(ranked.c.row_number <= limit)))
+        )
+        tasks: Dict[int, TypingList[Task]] = {list_id: [] for list_id in list_ids}
+        for task in result.scalars():
+            tasks[task.list_id].append(task)
+        for page in tasks.values():
+            page.sort(key=lambda task: (task.position, task.rank, task.id))
+        return tasks
+
+    async def get_with_owner(
+            self, db: AsyncSession, *, id: int, with_description: bool = True
+    ) -> Optional[Tuple[Task, int, int]]:
+        """
+        La tarea junto con el board_id y owner_id de su tablero, en una sola
+        consulta. Sin `with_description` la descripción queda diferida.
+        """
+        query = select(Task, List.board_id, Board.owner_id)
+        if with_description:
+            query = query.options(undefer(Task.description))
+        result = await db.execute(
+            query
+            .join(List, Task.list_id == List.id)
+            .join(Board, List.board_id == Board.id)
+            .filter(Task.id == id)
+        )
+        return result.first()
+
     async def move_to_list(
             self, db: AsyncSession, *, task: Task, list_id: int, position: int = None
     ) -> Task:
+        """Mueve la tarea al final de `position` (o de su posición actual) en `list_id`"""
+        row = {"list_id": list_id, "position": task.position if position is None else position}
+        await self._append_ranks(db, [row], exclude_id=task.id)
+        if list_id != task.list_id:
+            await adjust_task_counters(db, list_id=task.list_id, deltas={task.priority: -1})
+            await adjust_task_counters(db, list_id=list_id, deltas={task.priority: 1})
         task.list_id = list_id
-        if position is not None:
-            task.position = position
+        task.position = row["position"]
+        task.rank = row["rank"]
         db.add(task)
         await db.commit()
-        await db.refresh(task)
         return task
 
+    async def _neighbours(
+            self,
+            db: AsyncSession,
+            *,
+            task: Task,
+            list_id: int,
+            previous_id: Optional[int],
+            next_id: Optional[int],
+    ) -> Optional[Tuple[Any, Any]]:
+        """
+        (anterior, siguiente) de la posición pedida en `list_id`, como filas
+        (id, position, rank). Si solo se da una vecina la otra es su contigua.
+        Retorna None si alguna vecina no existe, es la propia tarea o no
+        pertenece a la lista.
+        """
+        columns = (Task.id, Task.list_id, Task.position, Task.rank)
+        ids = [id for id in (previous_id, next_id) if id is not None]
+        result = await db.execute(select(*columns).filter(Task.id.in_(ids)))
+        rows = {row.id: row for row in result}
+        if any(
+            id not in rows or id == task.id or rows[id].list_id != list_id for id in ids
+        ):
+            return None
+
+        previous, next_ = rows.get(previous_id), rows.get(next_id)
+        others = select(*columns).filter(Task.list_id == list_id, Task.id != task.id)
+        if previous is not None and next_ is not None:
+            if (previous.position, previous.rank, previous.id) >= (next_.position, next_.rank, next_.id):
+                return None
+        elif previous is not None:
+            result = await db.execute(
+                others
+                .filter(tuple_(*ORDER_KEY) > tuple_(previous.position, previous.rank, previous.id))
+                .order_by(*ORDER_KEY)
+                .limit(1)
+            )
+            next_ = result.first()
+        else:
+            result = await db.execute(
+                others
+                .filter(tuple_(*ORDER_KEY) < tuple_(next_.position, next_.rank, next_.id))
+                .order_by(*(column.desc() for column in ORDER_KEY))
+                .limit(1)
+            )
+            previous = result.first()
+        return previous, next_
+
+    @staticmethod
+    def _slot(previous: Any, next_: Any) -> Tuple[int, Optional[str]]:
+        """
+        (position, rank) entre las dos vecinas. rank es None si no cabe una
+        clave entre ellas (ranks empatados o demasiado largos).
+        """
+        if previous is None:
+            position, before, after = next_.position, None, next_.rank
+        elif next_ is None or next_.position != previous.position:
+            position, before, after = previous.position, previous.rank, None
+        else:
+            position, before, after = previous.position, previous.rank, next_.rank
+        if before is not None and after is not None and before >= after:
+            return position, None
+        rank = rank_between(before, after)
+        if len(rank) > RANK_MAX_LENGTH:
+            return position, None
+        return position, rank
+
+    async def place(
+            self,
+            db: AsyncSession,
+            *,
+            task: Task,
+            list_id: int,
+            previous_id: Optional[int] = None,
+            next_id: Optional[int] = None,
+    ) -> Optional[Task]:
+        """
+        Mueve la tarea a `list_id`, justo después de `previous_id` y/o antes de
+        `next_id`, actualizando solo su fila: toma la posición de una vecina y
+        un rank intermedio. Solo si no cabe ninguno se compacta la lista.
+        Retorna None si las vecinas no son válidas.
+        """
+        neighbours = await self._neighbours(
+            db, task=task, list_id=list_id, previous_id=previous_id, next_id=next_id
+        )
+        if neighbours is None:
+            return None
+        position, rank = self._slot(*neighbours)
+        if rank is None:
+            await self._compact(db, list_id=list_id)
+            neighbours = await self._neighbours(
+                db, task=task, list_id=list_id, previous_id=previous_id, next_id=next_id
+            )
+            position, rank = self._slot(*neighbours)
+
+        if list_id != task.list_id:
+            await adjust_task_counters(db, list_id=task.list_id, deltas={task.priority: -1})
+            await adjust_task_counters(db, list_id=list_id, deltas={task.priority: 1})
+        task.list_id = list_id
+        task.position = position
+        task.rank = rank
+        db.add(task)
+        await db.commit()
+        return task
+
+    async def _compact(self, db: AsyncSession, *, list_id: int, batch_size: int = 1000) -> None:
+        """Renumera las posiciones de la lista (0..n-1) y reinicia los ranks, sin commit"""
+        result = await db.execute(
+            select(Task.id).filter(Task.list_id == list_id).order_by(*ORDER_KEY)
+        )
+        ids = result.scalars().all()
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            await db.execute(
+                update(Task)
+                .where(Task.id.in_(chunk))
+                .values(
+                    position=case(
+                        {id: start + index for index, id in enumerate(chunk)}, value=Task.id
+                    ),
+                    rank=RANK_DEFAULT,
+                )
+                .execution_options(synchronize_session="fetch")
+            )
+
+    async def compact_ranks(self, db: AsyncSession, *, list_id: int, batch_size: int = 1000) -> None:
+        """Compacta las posiciones y ranks de una lista conservando el orden"""
+        await self._compact(db, list_id=list_id, batch_size=batch_size)
+        await db.commit()
+
+    async def lists_with_long_ranks(
+            self, db: AsyncSession, *, max_length: int, limit: int = 100
+    ) -> TypingList[int]:
+        """
+        Listas de las primeras `limit` tareas con un rank más largo que
+        `max_length`. Usa el índice sobre length(rank) (con DISTINCT el
+        planner prefiere recorrer la tabla), así que se deduplica aquí.
+        """
+        result = await db.execute(
+            select(Task.list_id).filter(func.length(Task.rank) > max_length).limit(limit)
+        )
+        return list(dict.fromkeys(result.scalars()))
+
 
 task = CRUDTask(Task)
@@ -1,10 +1,71 @@
+import re
 from typing import Optional
-from sqlalchemy import select
+from sqlalchemy import event, insert, inspect, or_, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.crud.base import CRUDBase
 from app.db.models.user import User
 from app.schemas.user import UserCreate, UserResponse
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import (
+    access_token_revocations,
+    get_password_hash_async,
+    verify_and_update_password_async,
+)
+
+# Usuarios autenticados recientemente, indexados por id. Desactivada (TTL 0)
+# con varios procesos: ver PRINCIPAL_CACHE_TTL_SECONDS
+principal_cache: TTLCache[User] = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE if settings.PRINCIPAL_CACHE_TTL_SECONDS else 0,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Índices únicos de users y el campo que protegen
+UNIQUE_INDEXES = {"ix_users_email": "email", "ix_users_username": "username"}
+# Mensaje de SQLite, que no expone el nombre del índice
+_SQLITE_UNIQUE = re.compile(r"UNIQUE constraint failed: users\.(email|username)\b")
+
+
+def duplicate_field(error: IntegrityError) -> Optional[str]:
+    """
+    Campo ("email" o "username") cuyo índice único violó `error`, o None si
+    el error es otro. Se usa el nombre del índice que da el driver (asyncpg o
+    psycopg) y no el texto del mensaje, que en Postgres incluye los valores.
+    """
+    orig = error.orig
+    for source in (orig, getattr(orig, "__cause__", None), getattr(orig, "diag", None)):
+        constraint = getattr(source, "constraint_name", None)
+        if constraint:
+            return UNIQUE_INDEXES.get(constraint)
+    match = _SQLITE_UNIQUE.search(str(orig))
+    return match.group(1) if match else None
+
+
+def _detached_copy(db_obj: User) -> User:
+    """Copia sin sesión para poder compartirla entre peticiones"""
+    mapper = inspect(User)
+    return User(**{attr.key: getattr(db_obj, attr.key) for attr in mapper.column_attrs})
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_principal(mapper, connection, target: User) -> None:
+    principal_cache.pop(target.id)
+
+
+@event.listens_for(User, "after_update")
+def _track_token_revocation(mapper, connection, target: User) -> None:
+    state = inspect(target)
+    if not (
+            state.attrs.is_active.history.has_changes()
+            or state.attrs.token_version.history.has_changes()
+    ):
+        return
+    if not target.is_active:
+        access_token_revocations.revoke(target.id, access_token_revocations.REVOKE_ALL)
+    else:
+        access_token_revocations.revoke(target.id, target.token_version)
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserResponse]):
@@ -16,25 +77,92 @@ class CRUDUser(CRUDBase[User, UserCreate, UserResponse]):
         result = await db.execute(select(User).filter(User.username == username))
         return result.scalars().first()
 
-    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
-        db_obj = User(
-            email=obj_in.email,
-            username=obj_in.username,
-            hashed_password=get_password_hash(obj_in.password)
+    async def get_conflicting_field(
+            self, db: AsyncSession, *, email: str, username: str
+    ) -> Optional[str]:
+        """
+        "email" o "username" si ya hay un usuario con ese valor (email primero),
+        o None. Es una consulta por índice, mucho más barata que el hash de bcrypt.
+        """
+        result = await db.execute(
+            select(User.email, User.username)
+            .filter(or_(User.email == email, User.username == username))
+            .limit(2)
         )
-        db.add(db_obj)
-        await db.commit()
-        await db.refresh(db_obj)
+        rows = result.all()
+        if any(row.email == email for row in rows):
+            return "email"
+        if rows:
+            return "username"
+        return None
+
+    async def get_principal(self, db: AsyncSession, *, id: int) -> Optional[User]:
+        """
+        Usuario autenticado, servido desde principal_cache cuando es posible.
+
+        El objeto devuelto es de solo lectura y no pertenece a ninguna sesión.
+        """
+        principal = principal_cache.get(id)
+        if principal is not None:
+            return principal
+
+        db_obj = await self.get(db, id=id)
+        if db_obj is None:
+            return None
+
+        principal = _detached_copy(db_obj)
+        principal_cache.set(id, principal)
+        return principal
+
+    async def create(self, db: AsyncSession, *, obj_in: UserCreate) -> User:
+        """
+        Insertar el usuario con un único INSERT ... RETURNING.
+
+        Conviene llamar antes a get_conflicting_field para no gastar un hash
+        de bcrypt en un duplicado. Los duplicados que aun así lleguen (dos
+        registros simultáneos) los detectan los índices únicos; en ese caso
+        se hace rollback y se propaga el IntegrityError.
+        """
+        hashed_password = await get_password_hash_async(obj_in.password)
+        try:
+            result = await db.execute(
+                insert(User)
+                .values(
+                    email=obj_in.email,
+                    username=obj_in.username,
+                    hashed_password=hashed_password
+                )
+                .returning(User)
+            )
+            db_obj = result.scalars().one()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise
         return db_obj
 
+    async def revoke_tokens(self, db: AsyncSession, *, db_obj: User) -> User:
+        """Invalida todos los access tokens emitidos hasta ahora para el usuario"""
+        return await self.update(
+            db, db_obj=db_obj, obj_in={"token_version": (db_obj.token_version or 0) + 1}
+        )
+
     async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
         user = await self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        verified, new_hash = await verify_and_update_password_async(
+            password, user.hashed_password
+        )
+        if not verified:
             return None
+
+        # Actualizar hashes con un coste de bcrypt distinto al configurado
+        if new_hash:
+            user.hashed_password = new_hash
+            db.add(user)
+            await db.commit()
         return user
 
 
 user = CRUDUser(User)
-
@@ -1,7 +1,23 @@
-from sqlalchemy import Column, DateTime
+from sqlalchemy import Column, DateTime, Integer
 from sqlalchemy.sql import func
 
 
 class TimeStampedModel:
+    # Los valores generados por la base de datos (id, created_at, updated_at)
+    # se leen con INSERT/UPDATE ... RETURNING en el mismo flush, sin refresh
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class TaskCounters:
+    """
+    Contadores de tareas desnormalizados (total y por prioridad).
+    Los mantiene app.crud.counters en la misma transacción que los cambios.
+    """
+    task_count = Column(Integer, default=0, server_default="0", nullable=False)
+    low_count = Column(Integer, default=0, server_default="0", nullable=False)
+    medium_count = Column(Integer, default=0, server_default="0", nullable=False)
+    high_count = Column(Integer, default=0, server_default="0", nullable=False)
+    urgent_count = Column(Integer, default=0, server_default="0", nullable=False)
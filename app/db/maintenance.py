@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+from app.core.config import settings
+from app.crud.counters import repair_task_counters
+from app.crud.revoked_token import revoked_token as revoked_token_crud
+from app.crud.task import task as task_crud
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_revoked_token_filter() -> None:
+    """Cargar en el filtro de Bloom los refresh tokens revocados vigentes"""
+    try:
+        async with AsyncSessionLocal() as db:
+            loaded = await revoked_token_crud.load_filter(db)
+        logger.info("Loaded %d revoked refresh tokens", loaded)
+    except Exception:
+        # Sin filtro precargado la revocación sigue siendo correcta:
+        # la inserción en revoked_tokens detecta los tokens reutilizados
+        logger.exception("Could not load revoked refresh tokens")
+
+
+async def purge_revoked_tokens_forever() -> None:
+    """Purgar periódicamente los refresh tokens revocados que ya expiraron"""
+    while True:
+        await asyncio.sleep(settings.REVOKED_TOKEN_PURGE_INTERVAL_SECONDS)
+        try:
+            async with AsyncSessionLocal() as db:
+                purged = await revoked_token_crud.purge_expired(
+                    db, batch_size=settings.REVOKED_TOKEN_PURGE_BATCH_SIZE
+                )
+                if purged:
+                    # Un filtro de Bloom no admite borrados: se reconstruye
+                    await revoked_token_crud.load_filter(db)
+            logger.info("Purged %d expired revoked refresh tokens", purged)
+        except Exception:
+            logger.exception("Could not purge revoked refresh tokens")
+
+
+async def repair_counters() -> None:
+    """Recalcular los contadores de tareas de todas las listas y tableros"""
+    async with AsyncSessionLocal() as db:
+        lists, boards = await repair_task_counters(db)
+    logger.info("Repaired task counters of %d lists and %d boards", lists, boards)
+
+
+async def compact_task_ranks() -> int:
+    """Compactar las listas cuyos ranks superan TASK_RANK_COMPACT_LENGTH"""
+    compacted = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            list_ids = await task_crud.lists_with_long_ranks(
+                db, max_length=settings.TASK_RANK_COMPACT_LENGTH
+            )
+            if not list_ids:
+                return compacted
+            for list_id in list_ids:
+                await task_crud.compact_ranks(
+                    db, list_id=list_id, batch_size=settings.TASK_RANK_COMPACT_BATCH_SIZE
+                )
+            compacted += len(list_ids)
+
+
+async def compact_task_ranks_forever() -> None:
+    """Compactar periódicamente los ranks de tareas que crecieron demasiado"""
+    while True:
+        await asyncio.sleep(settings.TASK_RANK_COMPACT_INTERVAL_SECONDS)
+        try:
+            compacted = await compact_task_ranks()
+            if compacted:
+                logger.info("Compacted task ranks of %d lists", compacted)
+        except Exception:
+            logger.exception("Could not compact task ranks")
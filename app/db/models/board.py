@@ -1,18 +1,28 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, Text
+from sqlalchemy.orm import deferred, relationship
 from app.db.session import Base
-from app.db.base import TimeStampedModel
+from app.db.base import TaskCounters, TimeStampedModel
 
 
-class Board(Base, TimeStampedModel):
+class Board(Base, TimeStampedModel, TaskCounters):
     __tablename__ = "boards"
+    __table_args__ = (
+        # get_by_owner filtra por owner y pagina por id
+        Index("ix_boards_owner_id_id", "owner_id", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
-    description = Column(Text, nullable=True)
+    # Diferida: quien la serialice debe pedirla con undefer (ver CRUDBase._load_only)
+    description = deferred(Column(Text, nullable=True), raiseload=True)
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Relaciones
     owner = relationship("User", back_populates="boards")
-    lists = relationship("List", back_populates="board", cascade="all, delete-orphan")
+    lists = relationship(
+        "List",
+        back_populates="board",
+        cascade="all, delete-orphan",
+        order_by="(List.position, List.id)",
+    )
 
@@ -1,11 +1,15 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.session import Base
-from app.db.base import TimeStampedModel
+from app.db.base import TaskCounters, TimeStampedModel
 
 
-class List(Base, TimeStampedModel):
+class List(Base, TimeStampedModel, TaskCounters):
     __tablename__ = "lists"
+    __table_args__ = (
+        # get_by_board filtra por tablero y ordena por (posición, id)
+        Index("ix_lists_board_id_position_id", "board_id", "position", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(100), nullable=False)
@@ -14,5 +18,10 @@ class List(Base, TimeStampedModel):
 
     # Relaciones
     board = relationship("Board", back_populates="lists")
-    tasks = relationship("Task", back_populates="list", cascade="all, delete-orphan")
+    tasks = relationship(
+        "Task",
+        back_populates="list",
+        cascade="all, delete-orphan",
+        order_by="(Task.position, Task.rank, Task.id)",
+    )
 
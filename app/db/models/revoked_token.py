@@ -0,0 +1,11 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)  # Se puede purgar pasada esta fecha
+    created_at = Column(DateTime, default=func.now(), nullable=False)
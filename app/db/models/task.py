@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, Enum as SQLEnum, text
 import enum
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import deferred, relationship
 from app.db.session import Base
 from app.db.base import TimeStampedModel
+from app.core.ranking import RANK_DEFAULT, RANK_MAX_LENGTH
 
 
 class TaskPriority(str, enum.Enum):
@@ -14,11 +15,22 @@ class TaskPriority(str, enum.Enum):
 
 class Task(Base, TimeStampedModel):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # get_by_list filtra por lista y pagina por (position, rank, id)
+        Index("ix_tasks_list_id_position_rank_id", "list_id", "position", "rank", "id"),
+        # lists_with_long_ranks busca las tareas con ranks largos sin recorrer la tabla
+        Index("ix_tasks_rank_length", text("length(rank)")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
-    description = Column(Text, nullable=True)
+    # Diferida: quien la serialice debe pedirla con undefer (ver CRUDBase._load_only)
+    description = deferred(Column(Text, nullable=True), raiseload=True)
     position = Column(Integer, default=0)  # Para ordenar tareas dentro de una lista
+    # Desempate fraccionario entre tareas de la misma posición (app.core.ranking)
+    rank = Column(
+        String(RANK_MAX_LENGTH), default=RANK_DEFAULT, server_default=RANK_DEFAULT, nullable=False
+    )
     priority = Column(SQLEnum(TaskPriority), default=TaskPriority.MEDIUM)
     list_id = Column(Integer, ForeignKey("lists.id"), nullable=False)
 
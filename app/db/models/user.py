@@ -13,6 +13,7 @@ class User(Base, TimeStampedModel):
     username = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)  # Se incrementa para revocar tokens
 
     # Relaciones
     boards = relationship("Board", back_populates="owner", cascade="all, delete-orphan")
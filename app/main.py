@@ -1,15 +1,71 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.api.v1.router import api_router
+from app.api.deps import token_cache
+from app.core.hashing import password_hasher
+from app.core.pagination import NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER
+from app.core.security import calibrate_bcrypt_rounds, configure_bcrypt_rounds
+from app.core.throttle import login_throttle
+from app.crud.board import board_owner_cache
+from app.crud.list import list_board_cache
+from app.crud.revoked_token import revoked_token as revoked_token_crud
+from app.crud.user import principal_cache
+from app.db.maintenance import (
+    compact_task_ranks_forever,
+    purge_revoked_tokens_forever,
+    warm_revoked_token_filter,
+)
 from app.db.session import engine, Base
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.BCRYPT_TARGET_VERIFY_MS and not settings.BCRYPT_ROUNDS:
+        if settings.WEB_CONCURRENCY > 1:
+            # Cada proceso podría elegir un coste distinto
+            logger.warning(
+                "BCRYPT_TARGET_VERIFY_MS ignored with WEB_CONCURRENCY=%d; "
+                "pin BCRYPT_ROUNDS (python -m app.cli calibrate-bcrypt)",
+                settings.WEB_CONCURRENCY,
+            )
+        else:
+            rounds = await password_hasher.run(
+                calibrate_bcrypt_rounds, settings.BCRYPT_TARGET_VERIFY_MS
+            )
+            configure_bcrypt_rounds(rounds)
+    await warm_revoked_token_filter()
+    purge_task = asyncio.create_task(purge_revoked_tokens_forever())
+    compact_task = None
+    if settings.WEB_CONCURRENCY == 1:
+        compact_task = asyncio.create_task(compact_task_ranks_forever())
+    else:
+        # Cada proceso compactaría las mismas listas a la vez
+        logger.info(
+            "Task rank compaction disabled with WEB_CONCURRENCY=%d; "
+            "schedule python -m app.cli compact-ranks",
+            settings.WEB_CONCURRENCY,
+        )
+    yield
+    purge_task.cancel()
+    if compact_task is not None:
+        compact_task.cancel()
+    password_hasher.shutdown()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS
@@ -19,6 +75,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, TOTAL_COUNT_HEADER],
 )
 
 # Routers
@@ -44,3 +101,16 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+async def metrics():
+    return {
+        "password_hashing": password_hasher.stats(),
+        "login_throttle": login_throttle.stats(),
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "revoked_refresh_tokens": revoked_token_crud.stats(),
+        "board_owner_cache": board_owner_cache.stats(),
+        "list_board_cache": list_board_cache.stats(),
+    }
@@ -1,11 +1,12 @@
 from app.schemas.user import UserBase, UserCreate, UserLogin, UserResponse
 from app.schemas.token import Token, TokenPayload, RefreshTokenRequest, TokenRefreshResponse
-from app.schemas.board import BoardBase, BoardCreate, BoardUpdate, BoardResponse, BoardWithLists
-from app.schemas.list import ListBase, ListCreate, ListUpdate, ListResponse, ListWithTasks
-from app.schemas.task import TaskBase, TaskCreate, TaskUpdate, TaskMove, TaskResponse
+from app.schemas.board import BoardBase, BoardCreate, BoardUpdate, BoardResponse, BoardWithLists, BoardFull
+from app.schemas.list import ListBase, ListCreate, ListUpdate, ListResponse, ListWithTasks, ReorderRequest
+from app.schemas.task import TaskBase, TaskCreate, TaskBulkCreate, TaskUpdate, TaskMove, TaskResponse, TaskCounts
 
 # Resolver referencias circulares
 BoardWithLists.model_rebuild()
+BoardFull.model_rebuild()
 ListWithTasks.model_rebuild()
 
 __all__ = [
@@ -25,16 +26,20 @@ __all__ = [
     "BoardUpdate",
     "BoardResponse",
     "BoardWithLists",
+    "BoardFull",
     # List
     "ListBase",
     "ListCreate",
     "ListUpdate",
     "ListResponse",
     "ListWithTasks",
+    "ReorderRequest",
     # Task
     "TaskBase",
     "TaskCreate",
+    "TaskBulkCreate",
     "TaskUpdate",
     "TaskMove",
     "TaskResponse",
+    "TaskCounts",
 ]
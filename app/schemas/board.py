@@ -2,9 +2,10 @@
 from pydantic import BaseModel, Field
 from typing import Optional, List, TYPE_CHECKING
 from datetime import datetime
+from app.schemas.task import TaskCounts
 
 if TYPE_CHECKING:
-    from app.schemas.list import ListResponse
+    from app.schemas.list import ListResponse, ListWithTasks
 
 
 class BoardBase(BaseModel):
@@ -21,7 +22,7 @@ class BoardUpdate(BaseModel):
     description: Optional[str] = None
 
 
-class BoardResponse(BoardBase):
+class BoardResponse(BoardBase, TaskCounts):
     id: int
     owner_id: int
     created_at: datetime
@@ -31,4 +32,8 @@ class BoardResponse(BoardBase):
 
 
 class BoardWithLists(BoardResponse):
-    lists: List["ListResponse"] = []  # Forward reference como string
\ No newline at end of file
+    lists: List["ListResponse"] = []  # Forward reference como string
+
+
+class BoardFull(BoardResponse):
+    lists: List["ListWithTasks"] = []
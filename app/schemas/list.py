@@ -1,7 +1,8 @@
 # app/schemas/list.py
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List as TypingList, TYPE_CHECKING
 from datetime import datetime
+from app.schemas.task import TaskCounts
 
 if TYPE_CHECKING:
     from app.schemas.task import TaskResponse
@@ -21,7 +22,7 @@ class ListUpdate(BaseModel):
     position: Optional[int] = Field(None, ge=0)
 
 
-class ListResponse(ListBase):
+class ListResponse(ListBase, TaskCounts):
     id: int
     board_id: int
     created_at: datetime
@@ -31,4 +32,22 @@ class ListResponse(ListBase):
 
 
 class ListWithTasks(ListResponse):
-    tasks: TypingList["TaskResponse"] = []  # Forward reference como string
\ No newline at end of file
+    tasks: TypingList["TaskResponse"] = []  # Forward reference como string
+    # Cursor para seguir en GET /tasks/list/{id} si no se incluyeron todas
+    tasks_next_cursor: Optional[str] = None
+
+
+class ReorderRequest(BaseModel):
+    """
+    Todos los ids del contenedor en el nuevo orden: cada uno recibe
+    position = su índice. Sin máximo: la lista debe estar completa, sea cual
+    sea el número de hijos.
+    """
+    ids: TypingList[int] = Field(..., min_length=1)
+
+    @field_validator("ids")
+    @classmethod
+    def unique_ids(cls, ids: TypingList[int]) -> TypingList[int]:
+        if len(set(ids)) != len(ids):
+            raise ValueError("ids must be unique")
+        return ids
@@ -1,6 +1,7 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator, model_validator
+from typing import List, Optional
 from datetime import datetime
+from app.core.config import settings
 from app.db.models.task import TaskPriority
 
 
@@ -15,16 +16,37 @@ class TaskCreate(TaskBase):
     list_id: int
 
 
+class TaskBulkCreate(BaseModel):
+    tasks: List[TaskCreate] = Field(..., min_length=1, max_length=settings.TASK_BULK_MAX)
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     description: Optional[str] = None
     priority: Optional[TaskPriority] = None
     position: Optional[int] = Field(None, ge=0)
 
+    @field_validator("priority")
+    @classmethod
+    def priority_not_null(cls, priority: Optional[TaskPriority]) -> TaskPriority:
+        # Omitirla la deja igual; null no es una prioridad (ni se puede contar)
+        if priority is None:
+            raise ValueError("priority cannot be null")
+        return priority
+
 
 class TaskMove(BaseModel):
     list_id: int
     position: Optional[int] = Field(None, ge=0)
+    # Alternativa a `position`: colocar la tarea entre estas vecinas de la lista destino
+    previous_id: Optional[int] = None
+    next_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def position_or_neighbours(self) -> "TaskMove":
+        if self.position is not None and (self.previous_id or self.next_id):
+            raise ValueError("Use either position or previous_id/next_id")
+        return self
 
 
 class TaskResponse(TaskBase):
@@ -35,3 +57,11 @@ class TaskResponse(TaskBase):
 
     model_config = {"from_attributes": True}
 
+
+class TaskCounts(BaseModel):
+    """Contadores de tareas de una lista o tablero"""
+    task_count: int = 0
+    low_count: int = 0
+    medium_count: int = 0
+    high_count: int = 0
+    urgent_count: int = 0
@@ -0,0 +1,190 @@
+"""
+Benchmark del camino de autenticación: /auth/login, /auth/refresh y /auth/me.
+
+Las peticiones pasan por la app completa (ASGITransport) contra una base de
+datos SQLite temporal, con varios niveles de concurrencia. Los resultados
+se escriben en JSON para poder compararlos entre revisiones:
+
+    python -m benchmarks.bench_auth --output benchmarks/results/auth.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List
+
+from benchmarks.common import configure_environment
+
+configure_environment()
+
+from httpx import ASGITransport, AsyncClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.security import configure_bcrypt_rounds, create_refresh_token  # noqa: E402
+from app.core.throttle import login_throttle  # noqa: E402
+from app.db.session import Base, get_db  # noqa: E402
+from app.main import app  # noqa: E402
+
+API = settings.API_V1_STR
+USER = {"email": "bench@example.com", "username": "benchuser", "password": "Bench1234"}
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(
+        make_request: Callable[[int], Awaitable[int]],
+        requests: int,
+        concurrency: int,
+        statements: List[str],
+) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            status = await make_request(i)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+
+    statements.clear()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "errors": errors,
+        "requests_per_second": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+        "queries_per_request": round(len(statements) / requests, 2),
+    }
+
+
+async def main_async(args: argparse.Namespace) -> Dict:
+    if args.bcrypt_rounds:
+        configure_bcrypt_rounds(args.bcrypt_rounds)
+    # Todas las peticiones salen de la misma cuenta e IP
+    login_throttle.enabled = False
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench_auth.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    statements: List[str] = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    results: Dict[str, List[Dict[str, float]]] = {}
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+        response = await client.post(f"{API}/auth/register", json=USER)
+        user_id = response.json()["id"]
+        response = await client.post(
+            f"{API}/auth/login", data={"username": USER["email"], "password": USER["password"]}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        async def login(i: int) -> int:
+            response = await client.post(
+                f"{API}/auth/login",
+                data={"username": USER["email"], "password": USER["password"]},
+            )
+            return response.status_code
+
+        async def me(i: int) -> int:
+            return (await client.get(f"{API}/auth/me", headers=headers)).status_code
+
+        for name, requests in (("login", args.login_requests), ("me", args.requests)):
+            make_request = login if name == "login" else me
+            results[name] = [
+                await run_level(make_request, requests, concurrency, statements)
+                for concurrency in args.concurrency
+            ]
+
+        # Cada refresh revoca su token, así que se prepara uno por petición
+        results["refresh"] = []
+        for concurrency in args.concurrency:
+            tokens = [create_refresh_token({"sub": str(user_id)}) for _ in range(args.requests)]
+
+            async def refresh(i: int) -> int:
+                response = await client.post(
+                    f"{API}/auth/refresh", json={"refresh_token": tokens[i]}
+                )
+                return response.status_code
+
+            results["refresh"].append(
+                await run_level(refresh, args.requests, concurrency, statements)
+            )
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+    return {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "bcrypt_rounds": args.bcrypt_rounds or "default",
+        "token_backend": settings.TOKEN_BACKEND,
+        "self_contained_tokens": settings.ACCESS_TOKEN_SELF_CONTAINED,
+        "endpoints": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--login-requests", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--bcrypt-rounds", type=int, default=None)
+    parser.add_argument("--output", default=os.path.join("benchmarks", "results", "auth.json"))
+    args = parser.parse_args()
+
+    report = asyncio.run(main_async(args))
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+        f.write("\n")
+
+    for name, levels in report["endpoints"].items():
+        for level in levels:
+            print(
+                f"{name:8} c={level['concurrency']:<3} {level['requests_per_second']:8.1f} req/s "
+                f"p50={level['p50_ms']:8.2f}ms p95={level['p95_ms']:8.2f}ms "
+                f"p99={level['p99_ms']:8.2f}ms q/req={level['queries_per_request']} "
+                f"errors={level['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
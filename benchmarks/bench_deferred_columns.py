@@ -0,0 +1,111 @@
+"""
+Bytes leídos y tiempo de hidratación del ORM al listar tareas con y sin la
+descripción (columna Text diferida por defecto).
+
+    python -m benchmarks.bench_deferred_columns --tasks 2000 --description-bytes 2000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import List, Tuple
+
+from benchmarks.common import configure_environment
+
+configure_environment()
+
+from sqlalchemy import event, select  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker, undefer  # noqa: E402
+
+from app.crud.task import task as task_crud  # noqa: E402
+from app.db.models.board import Board  # noqa: E402
+from app.db.models.list import List as ListModel  # noqa: E402
+from app.db.models.task import Task  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+from app.db.session import Base  # noqa: E402
+
+CARD_FIELDS = ["id", "title", "priority", "position"]
+
+
+def row_bytes(rows) -> int:
+    return sum(len(str(value).encode()) for row in rows for value in row if value is not None)
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    db_path = os.path.join(tempfile.mkdtemp(), "bench_deferred.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        board = Board(title="Board", owner_id=user.id)
+        db.add(board)
+        await db.flush()
+        list_obj = ListModel(title="Lista", board_id=board.id)
+        db.add(list_obj)
+        await db.flush()
+        db.add_all(
+            Task(title=f"Tarea {i}", description="x" * args.description_bytes,
+                 position=i, list_id=list_obj.id)
+            for i in range(args.tasks)
+        )
+        await db.commit()
+        list_id = list_obj.id
+
+    queries = [
+        ("all columns", select(Task).options(undefer(Task.description))),
+        ("deferred", select(Task)),
+        ("card fields", task_crud._load_only(select(Task), CARD_FIELDS, "position")),
+    ]
+
+    results: List[Tuple[str, int, float]] = []
+    for name, query in queries:
+        query = query.filter(Task.list_id == list_id).order_by(Task.position, Task.id)
+
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        async with session_factory() as db:
+            await db.execute(query)
+        event.remove(engine.sync_engine, "before_cursor_execute", capture)
+        async with engine.connect() as conn:
+            statement, parameters = statements[0]
+            read = row_bytes((await conn.exec_driver_sql(statement, parameters)).all())
+
+        start = time.perf_counter()
+        for _ in range(args.iterations):
+            # Sesión nueva en cada vuelta: el identity map no reutiliza objetos
+            async with session_factory() as db:
+                (await db.execute(query)).scalars().all()
+        elapsed_ms = (time.perf_counter() - start) / args.iterations * 1000
+        results.append((name, read, elapsed_ms))
+
+    await engine.dispose()
+
+    base_read, base_ms = results[0][1], results[0][2]
+    for name, read, elapsed_ms in results:
+        print(
+            f"{name:12} {read / 1024:10.1f} KiB read  {elapsed_ms:8.2f} ms/query  "
+            f"({read / base_read:.0%} bytes, {elapsed_ms / base_ms:.0%} time)"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--description-bytes", type=int, default=2000)
+    parser.add_argument("--iterations", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
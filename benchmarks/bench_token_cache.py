@@ -0,0 +1,33 @@
+"""
+Coste por petición de verificar un access token con y sin memoización.
+
+    python -m benchmarks.bench_token_cache
+"""
+import argparse
+
+from benchmarks.common import configure_environment, per_call_us
+
+configure_environment()
+
+from app.api.deps import decode_token, token_cache  # noqa: E402
+from app.core.security import create_access_token, token_codec  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token(data={"sub": "1"})
+    token_cache.clear()
+
+    uncached = per_call_us(lambda: token_codec.decode(token), args.iterations)
+    cached = per_call_us(lambda: decode_token(token), args.iterations)
+
+    print(f"codec.decode    {uncached:8.2f} us/request")
+    print(f"decode_token    {cached:8.2f} us/request")
+    print(f"saving          {uncached - cached:8.2f} us/request ({uncached / cached:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Throughput de firma y verificación de JWT por backend y algoritmo.
+
+    python -m benchmarks.bench_token_codec
+
+Los algoritmos asimétricos necesitan el paquete `cryptography` y el backend
+pyjwt necesita PyJWT; las combinaciones no disponibles se omiten.
+"""
+import argparse
+import time
+
+from benchmarks.common import configure_environment, per_call_us
+
+configure_environment()
+
+from app.core.security import TOKEN_CODECS, build_token_codec  # noqa: E402
+
+ALGORITHMS = ["HS256", "ES256", "EdDSA"]
+
+
+def generate_keys(algorithm: str):
+    """(private_pem, public_pem) para el algoritmo, o (None, None) si es simétrico"""
+    if algorithm.startswith("HS"):
+        return None, None
+
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec, ed25519
+
+    if algorithm == "ES256":
+        private = ec.generate_private_key(ec.SECP256R1())
+    else:
+        private = ed25519.Ed25519PrivateKey.generate()
+
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    claims = {"sub": "1", "type": "access", "exp": int(time.time()) + 1800}
+
+    print(f"{'backend':8} {'algorithm':9} {'encode/s':>10} {'decode/s':>10}")
+    for algorithm in ALGORITHMS:
+        try:
+            private_pem, public_pem = generate_keys(algorithm)
+        except ImportError:
+            print(f"{'-':8} {algorithm:9} skipped (cryptography not installed)")
+            continue
+
+        for backend in TOKEN_CODECS:
+            try:
+                codec = build_token_codec(
+                    backend,
+                    algorithm,
+                    secret_key="benchmark-secret-key-0123456789abcdef",
+                    private_key=private_pem,
+                    public_key=public_pem,
+                )
+                token = codec.encode(claims)
+                codec.decode(token)
+            except Exception as e:
+                print(f"{backend:8} {algorithm:9} skipped ({e.__class__.__name__}: {e})")
+                continue
+
+            encode_us = per_call_us(lambda: codec.encode(claims), args.iterations)
+            decode_us = per_call_us(lambda: codec.decode(token), args.iterations)
+            print(
+                f"{backend:8} {algorithm:9} "
+                f"{1_000_000 / encode_us:10.0f} {1_000_000 / decode_us:10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Coste por actualización de CRUDBase.update: recorrer el objeto con
+jsonable_encoder y asignar todos los campos (antes) frente a comparar solo
+las columnas del mapper y omitir la escritura si nada cambia (ahora).
+
+    python -m benchmarks.bench_update_diffing --iterations 2000
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict
+
+from benchmarks.common import configure_environment, per_call_us
+
+configure_environment()
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+
+from app.crud.task import task as task_crud  # noqa: E402
+from app.db.models.board import Board  # noqa: E402
+from app.db.models.list import List as ListModel  # noqa: E402
+from app.db.models.task import Task, TaskPriority  # noqa: E402
+from app.db.models.user import User  # noqa: E402
+from app.db.session import Base  # noqa: E402
+
+
+def apply_all_fields(db_obj: Task, update_data: Dict[str, Any]) -> bool:
+    """Implementación anterior: asigna todo lo recibido, cambie o no"""
+    obj_data = jsonable_encoder(db_obj)
+    for field in obj_data:
+        if field in update_data:
+            setattr(db_obj, field, update_data[field])
+    return True
+
+
+async def timed_updates(session_factory, task_id: int, payload: Dict[str, Any],
+                        iterations: int, diff: bool) -> float:
+    """ms por update completo (asignar + commit) sobre la misma tarea"""
+    async with session_factory() as db:
+        task = await task_crud.get(db, id=task_id)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            if diff:
+                await task_crud.update(db, db_obj=task, obj_in=payload)
+            else:
+                apply_all_fields(task, payload)
+                db.add(task)
+                await db.commit()
+        return (time.perf_counter() - start) / iterations * 1000
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    db_path = os.path.join(tempfile.mkdtemp(), "bench_update.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session_factory() as db:
+        user = User(email="bench@example.com", username="bench", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        board = Board(title="Board", owner_id=user.id)
+        db.add(board)
+        await db.flush()
+        list_obj = ListModel(title="Lista", board_id=board.id)
+        db.add(list_obj)
+        await db.flush()
+        task = Task(title="Tarea", description="x" * 500, priority=TaskPriority.MEDIUM,
+                    position=0, list_id=list_obj.id)
+        db.add(task)
+        await db.commit()
+        task_id = task.id
+
+    # Mismo contenido que la tarea: la petición típica de un formulario sin tocar
+    payload = {"title": "Tarea", "description": "x" * 500, "priority": TaskPriority.MEDIUM}
+
+    async with session_factory() as db:
+        task = await task_crud.get(db, id=task_id)
+        before_us = per_call_us(lambda: apply_all_fields(task, payload), args.iterations * 10)
+        after_us = per_call_us(lambda: task_crud._apply_changes(task, payload), args.iterations * 10)
+
+    before_ms = await timed_updates(session_factory, task_id, payload, args.iterations, diff=False)
+    after_ms = await timed_updates(session_factory, task_id, payload, args.iterations, diff=True)
+    await engine.dispose()
+
+    print(f"field walk   before {before_us:8.2f} us  after {after_us:8.2f} us  "
+          f"({before_us / after_us:.1f}x)")
+    print(f"no-op update before {before_ms:8.3f} ms  after {after_ms:8.3f} ms  "
+          f"({before_ms / after_ms:.1f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
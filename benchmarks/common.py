@@ -0,0 +1,20 @@
+import os
+import time
+from typing import Callable
+
+
+def configure_environment() -> None:
+    """Valores por defecto para poder importar `app` sin un .env"""
+    os.environ.setdefault("BACKEND_CORS_ORIGINS", '["*"]')
+    os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+    os.environ.setdefault("ASYNC_DATABASE_URL", "sqlite+aiosqlite:///./bench.db")
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key-0123456789abcdef")
+
+
+def per_call_us(func: Callable[[], object], iterations: int) -> float:
+    """Tiempo medio por llamada en microsegundos"""
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1_000_000
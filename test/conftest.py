@@ -5,9 +5,13 @@ from typing import AsyncGenerator, Dict
 import pytest
 from faker import Faker
 from httpx import AsyncClient, ASGITransport  # ← Agregar ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
+from app.core.throttle import login_throttle
+from app.crud.board import board_owner_cache
+from app.crud.list import list_board_cache
 from app.db.session import Base, get_db
 from app.main import app
 
@@ -60,6 +64,19 @@ async def db_session(engine) -> AsyncGenerator[AsyncSession, None]:
         await session.rollback()
 
 
+@pytest.fixture
+def query_counter(engine):
+    """Registra las sentencias SQL ejecutadas contra la base de datos de test"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
 @pytest.fixture
 async def client(db_session) -> AsyncGenerator[AsyncClient, None]:
     """Cliente HTTP para tests"""
@@ -68,6 +85,9 @@ async def client(db_session) -> AsyncGenerator[AsyncClient, None]:
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    board_owner_cache.clear()
+    list_board_cache.clear()
+    login_throttle.reset()
 
     # ✅ CORRECCIÓN: Usar ASGITransport en lugar de app directamente
     async with AsyncClient(
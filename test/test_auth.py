@@ -1,5 +1,41 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from ipaddress import ip_network
+
 import pytest
+from fastapi import Request
 from httpx import AsyncClient
+from jose import jwt
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api import deps
+from app.api.deps import decode_token, get_client_ip, token_cache
+from app.api.v1.endpoints import auth as auth_endpoints
+from app.core.cache import BloomFilter
+from app.core.config import Settings, settings
+from app.core.exceptions import (
+    ConflictException,
+    ServiceUnavailableException,
+    TooManyRequestsException,
+)
+from app.core.hashing import PasswordHashExecutor, password_hasher
+from app.core.throttle import InMemoryThrottleBackend, LoginThrottle
+from app.core.security import (
+    BCRYPT_MIN_ROUNDS,
+    TOKEN_CODECS,
+    TokenError,
+    build_token_codec,
+    calibrate_bcrypt_rounds,
+    configure_bcrypt_rounds,
+    create_access_token,
+    pwd_context,
+)
+from app.crud.revoked_token import revoked_token as revoked_token_crud
+from app.crud.user import duplicate_field, principal_cache, user as user_crud
+from app.schemas import UserCreate
 
 
 class TestUserRegistration:
@@ -52,6 +88,77 @@ class TestUserRegistration:
         assert response.status_code == 409
         assert "already taken" in response.json()["detail"].lower()
 
+    @pytest.mark.asyncio
+    async def test_register_single_statement(self, client: AsyncClient, user_data, query_counter):
+        """El registro es una consulta de duplicados y un único INSERT ... RETURNING"""
+        response = await client.post("/api/v1/auth/register", json=user_data)
+
+        assert response.status_code == 201
+        assert len(query_counter) == 2
+        assert query_counter[0].startswith("SELECT users.email, users.username")
+        assert query_counter[1].startswith("INSERT INTO users")
+        assert "RETURNING" in query_counter[1]
+
+    @pytest.mark.asyncio
+    async def test_register_duplicate_without_hashing(self, client: AsyncClient, registered_user):
+        """Un duplicado se rechaza sin ejecutar bcrypt"""
+        hashed = password_hasher.stats()["completed"]
+
+        response = await client.post("/api/v1/auth/register", json={
+            "email": registered_user["email"], "username": "other_user", "password": "Test1234"
+        })
+
+        assert response.status_code == 409
+        assert password_hasher.stats()["completed"] == hashed
+
+    @pytest.mark.asyncio
+    async def test_register_duplicate_username_containing_email(self, client: AsyncClient):
+        """Un username con "email" dentro no se confunde con un email duplicado"""
+        user_data = {"email": "first@example.com", "username": "myemail", "password": "Test1234"}
+        assert (await client.post("/api/v1/auth/register", json=user_data)).status_code == 201
+
+        response = await client.post(
+            "/api/v1/auth/register", json={**user_data, "email": "second@example.com"}
+        )
+
+        assert response.status_code == 409
+        assert response.json()["detail"] == "Username already taken"
+
+    def test_duplicate_field_uses_constraint_name(self):
+        """El campo duplicado sale del nombre del índice, no del mensaje"""
+        class PostgresError(Exception):
+            constraint_name = "ix_users_username"
+
+        error = IntegrityError(
+            "INSERT", {}, PostgresError("Key (username)=(myemail) already exists")
+        )
+        assert duplicate_field(error) == "username"
+
+        sqlite_error = IntegrityError(
+            "INSERT", {}, Exception("UNIQUE constraint failed: users.email")
+        )
+        assert duplicate_field(sqlite_error) == "email"
+        assert duplicate_field(IntegrityError("INSERT", {}, Exception("NOT NULL"))) is None
+
+    @pytest.mark.asyncio
+    async def test_register_concurrent_duplicates(self, engine, user_data):
+        """Dos registros simultáneos del mismo email: solo uno se crea"""
+        async def attempt(username: str):
+            user_in = UserCreate(**{**user_data, "username": username})
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                try:
+                    return await auth_endpoints.register(db=session, user_in=user_in)
+                except ConflictException as e:
+                    return e
+
+        results = await asyncio.gather(
+            attempt(user_data["username"]), attempt(user_data["username"] + "_2")
+        )
+
+        conflicts = [r for r in results if isinstance(r, ConflictException)]
+        assert len(conflicts) == 1
+        assert conflicts[0].detail == "Email already registered"
+
     @pytest.mark.asyncio
     async def test_register_invalid_email(self, client: AsyncClient):
         """Email inválido"""
@@ -139,6 +246,164 @@ class TestUserLogin:
         assert response.status_code == 401
 
 
+class TestBcryptCost:
+    """Tests de calibración del coste de bcrypt"""
+
+    @pytest.fixture
+    def restore_pwd_context(self):
+        original = pwd_context.to_dict()
+        yield
+        pwd_context.load(original)
+
+    def test_calibration_within_bounds(self):
+        """La calibración respeta los límites de rounds"""
+        assert calibrate_bcrypt_rounds(10_000, min_rounds=4, max_rounds=6) == 6
+        assert calibrate_bcrypt_rounds(0, min_rounds=4, max_rounds=6) == 4
+
+    def test_rounds_below_minimum_rejected(self):
+        """No se puede fijar un coste menor que BCRYPT_MIN_ROUNDS"""
+        with pytest.raises(ValueError):
+            configure_bcrypt_rounds(BCRYPT_MIN_ROUNDS - 1)
+        with pytest.raises(ValidationError):
+            Settings(BCRYPT_ROUNDS=4)
+
+    @pytest.mark.asyncio
+    async def test_hash_upgraded_on_login(
+            self, client: AsyncClient, db_session, user_data, registered_user, restore_pwd_context
+    ):
+        """Un login correcto regenera el hash con el coste configurado"""
+        configure_bcrypt_rounds(BCRYPT_MIN_ROUNDS)
+
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": user_data["email"], "password": user_data["password"]}
+        )
+
+        assert response.status_code == 200
+        db_user = await user_crud.get(db_session, id=registered_user["id"])
+        assert db_user.hashed_password.startswith(f"$2b${BCRYPT_MIN_ROUNDS:02d}$")
+        assert not pwd_context.needs_update(db_user.hashed_password)
+
+        # El hash actualizado sigue siendo válido
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": user_data["email"], "password": user_data["password"]}
+        )
+        assert response.status_code == 200
+
+
+class TestLoginThrottle:
+    """Tests del throttling de login"""
+
+    def _throttle(self, **kwargs) -> LoginThrottle:
+        options = dict(account_burst=2, account_per_minute=1, ip_burst=100, ip_per_minute=1)
+        options.update(kwargs)
+        return LoginThrottle(InMemoryThrottleBackend(max_keys=100), **options)
+
+    def test_account_bucket_exhausted(self):
+        """Tras agotar el burst de una cuenta se rechazan los intentos"""
+        throttle = self._throttle()
+        throttle.acquire("victim@example.com", "10.0.0.1")
+        throttle.acquire("VICTIM@example.com", "10.0.0.2")
+
+        with pytest.raises(TooManyRequestsException) as exc_info:
+            throttle.acquire("victim@example.com", "10.0.0.3")
+
+        assert int(exc_info.value.headers["Retry-After"]) >= 1
+        assert throttle.stats()["throttled"] == 1
+        # Otras cuentas no se ven afectadas
+        throttle.acquire("other@example.com", "10.0.0.1")
+
+    def test_ip_bucket_exhausted(self):
+        """Una IP no puede probar muchas cuentas distintas"""
+        throttle = self._throttle(ip_burst=3)
+        for i in range(3):
+            throttle.acquire(f"user{i}@example.com", "10.0.0.1")
+
+        with pytest.raises(TooManyRequestsException):
+            throttle.acquire("user9@example.com", "10.0.0.1")
+
+    def test_successful_login_refunded(self):
+        """Los logins correctos no agotan el bucket"""
+        throttle = self._throttle()
+        for _ in range(5):
+            throttle.acquire("user@example.com", "10.0.0.1")
+            throttle.refund("user@example.com", "10.0.0.1")
+
+        assert throttle.stats()["throttled"] == 0
+
+    def test_backend_bounded(self):
+        """El backend en memoria no supera max_keys"""
+        backend = InMemoryThrottleBackend(max_keys=10)
+        throttle = LoginThrottle(
+            backend, account_burst=1, account_per_minute=1, ip_burst=1, ip_per_minute=1
+        )
+        for i in range(100):
+            throttle.acquire(f"user{i}@example.com", f"10.0.{i}.1")
+
+        assert len(backend) == 10
+
+    @pytest.mark.asyncio
+    async def test_login_throttled_without_hashing(
+            self, client: AsyncClient, registered_user, monkeypatch
+    ):
+        """Un intento rechazado responde 429 sin ejecutar bcrypt"""
+        monkeypatch.setattr(auth_endpoints, "login_throttle", self._throttle())
+        credentials = {"username": registered_user["email"], "password": "WrongPassword123"}
+        for _ in range(2):
+            response = await client.post("/api/v1/auth/login", data=credentials)
+            assert response.status_code == 401
+
+        hashed = password_hasher.stats()["completed"]
+        response = await client.post("/api/v1/auth/login", data=credentials)
+
+        assert response.status_code == 429
+        assert "Retry-After" in response.headers
+        assert password_hasher.stats()["completed"] == hashed
+
+    @pytest.mark.asyncio
+    async def test_busy_hasher_refunds_attempt(
+            self, client: AsyncClient, registered_user, monkeypatch
+    ):
+        """Un 503 del pool de bcrypt no consume intentos de login"""
+        monkeypatch.setattr(auth_endpoints, "login_throttle", self._throttle())
+
+        async def busy(*args, **kwargs):
+            raise ServiceUnavailableException("Authentication service busy, try again later")
+
+        credentials = {"username": registered_user["email"], "password": "WrongPassword123"}
+        with monkeypatch.context() as patched:
+            patched.setattr(password_hasher, "run", busy)
+            for _ in range(5):
+                response = await client.post("/api/v1/auth/login", data=credentials)
+                assert response.status_code == 503
+
+        # El burst de la cuenta (2) sigue intacto
+        for _ in range(2):
+            response = await client.post("/api/v1/auth/login", data=credentials)
+            assert response.status_code == 401
+        response = await client.post("/api/v1/auth/login", data=credentials)
+        assert response.status_code == 429
+
+    def _request(self, host: str, forwarded: str = None) -> Request:
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return Request({"type": "http", "client": (host, 1234), "headers": headers})
+
+    def test_client_ip_ignores_forwarded_from_untrusted(self, monkeypatch):
+        """Sin proxies de confianza X-Forwarded-For se ignora"""
+        monkeypatch.setattr(deps, "trusted_proxies", [])
+
+        assert get_client_ip(self._request("203.0.113.7", "198.51.100.1")) == "203.0.113.7"
+
+    def test_client_ip_behind_trusted_proxy(self, monkeypatch):
+        """Detrás de un proxy se usa la última dirección que no es de confianza"""
+        monkeypatch.setattr(deps, "trusted_proxies", [ip_network("10.0.0.0/8")])
+
+        request = self._request("10.0.0.2", "1.2.3.4, 198.51.100.1, 10.0.0.5")
+        assert get_client_ip(request) == "198.51.100.1"
+        assert get_client_ip(self._request("10.0.0.2")) == "10.0.0.2"
+
+
 class TestCurrentUser:
     """Tests de obtener usuario actual"""
 
@@ -153,6 +418,45 @@ class TestCurrentUser:
         assert data["username"] == registered_user["username"]
         assert data["id"] == registered_user["id"]
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_cached(
+            self, client: AsyncClient, auth_headers, registered_user, query_counter
+    ):
+        """La segunda petición autentica sin consultar la base de datos"""
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        hits = principal_cache.hits
+        query_counter.clear()
+
+        response = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert response.json()["id"] == registered_user["id"]
+        assert principal_cache.hits == hits + 1
+        assert query_counter == []
+
+    def test_principal_cache_single_process(self):
+        """La cache de usuarios es local al proceso: con varios va desactivada"""
+        assert Settings(WEB_CONCURRENCY=1).PRINCIPAL_CACHE_TTL_SECONDS == 60
+        assert Settings(WEB_CONCURRENCY=4).PRINCIPAL_CACHE_TTL_SECONDS == 0
+        assert Settings(WEB_CONCURRENCY=4, PRINCIPAL_CACHE_TTL_SECONDS=0).PRINCIPAL_CACHE_TTL_SECONDS == 0
+        with pytest.raises(ValidationError):
+            Settings(WEB_CONCURRENCY=4, PRINCIPAL_CACHE_TTL_SECONDS=60)
+
+    @pytest.mark.asyncio
+    async def test_get_current_user_cache_invalidated(
+            self, client: AsyncClient, db_session, auth_headers, registered_user
+    ):
+        """Desactivar al usuario invalida la entrada de la cache"""
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        db_user = await user_crud.get(db_session, id=registered_user["id"])
+        await user_crud.update(db_session, db_obj=db_user, obj_in={"is_active": False})
+
+        response = await client.get("/api/v1/auth/me", headers=auth_headers)
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Inactive user"
+
     @pytest.mark.asyncio
     async def test_get_current_user_no_token(self, client: AsyncClient):
         """Sin token"""
@@ -193,6 +497,65 @@ class TestRefreshToken:
         assert "access_token" in data
         assert "refresh_token" in data
 
+    @pytest.mark.asyncio
+    async def test_refresh_token_reuse_rejected(self, client: AsyncClient, user_data, registered_user):
+        """Un refresh token rotado no se puede volver a usar"""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": user_data["email"], "password": user_data["password"]}
+        )
+        refresh_token = login_response.json()["refresh_token"]
+
+        first = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+        second = await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+        assert first.status_code == 200
+        assert second.status_code == 401
+        assert "revoked" in second.json()["detail"].lower()
+
+        # El token nuevo sigue funcionando
+        rotated = first.json()["refresh_token"]
+        response = await client.post("/api/v1/auth/refresh", json={"refresh_token": rotated})
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_refresh_token_revoked_in_other_process(
+            self, client: AsyncClient, db_session, user_data, registered_user
+    ):
+        """Con el filtro vacío la inserción detecta el token ya revocado"""
+        login_response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": user_data["email"], "password": user_data["password"]}
+        )
+        refresh_token = login_response.json()["refresh_token"]
+        await client.post("/api/v1/auth/refresh", json={"refresh_token": refresh_token})
+
+        previous_filter = revoked_token_crud.filter
+        revoked_token_crud.filter = BloomFilter(capacity=10)
+        try:
+            response = await client.post(
+                "/api/v1/auth/refresh", json={"refresh_token": refresh_token}
+            )
+        finally:
+            revoked_token_crud.filter = previous_filter
+
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_purge_expired_revoked_tokens(self, db_session):
+        """Los tokens expirados se purgan en lotes"""
+        past = datetime.utcnow() - timedelta(days=1)
+        future = datetime.utcnow() + timedelta(days=1)
+        for i in range(5):
+            await revoked_token_crud.revoke(db_session, jti=f"expired-{i}", expires_at=past)
+        await revoked_token_crud.revoke(db_session, jti="still-valid", expires_at=future)
+
+        purged = await revoked_token_crud.purge_expired(db_session, batch_size=2)
+
+        assert purged >= 5
+        assert await revoked_token_crud.is_revoked(db_session, jti="still-valid")
+        assert not await revoked_token_crud.is_revoked(db_session, jti="expired-0")
+
     @pytest.mark.asyncio
     async def test_refresh_token_invalid(self, client: AsyncClient):
         """Refresh token inválido"""
@@ -219,4 +582,253 @@ class TestRefreshToken:
             json={"refresh_token": access_token}
         )
 
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+
+class TestBloomFilter:
+    """Tests del filtro de Bloom"""
+
+    def test_no_false_negatives(self):
+        """Todo lo añadido se reporta como presente"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        items = [f"jti-{i}" for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+
+        assert all(bloom.might_contain(item) for item in items)
+
+    def test_false_positive_rate(self):
+        """La tasa de falsos positivos se mantiene cerca de la configurada"""
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+
+        false_positives = sum(bloom.might_contain(f"other-{i}") for i in range(10000))
+
+        assert false_positives < 300
+
+
+@pytest.fixture(params=sorted(TOKEN_CODECS))
+def codec_backend(request):
+    if request.param == "pyjwt":
+        pytest.importorskip("jwt")
+    return request.param
+
+
+def _es256_keys():
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    private = ec.generate_private_key(ec.SECP256R1())
+    private_pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = private.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+class TestTokenCodec:
+    """Tests de los backends de JWT"""
+
+    CLAIMS = {"sub": "1", "type": "access", "exp": 4102444800}
+
+    def test_symmetric_roundtrip(self, codec_backend):
+        """HS256 firma y verifica con SECRET_KEY"""
+        codec = build_token_codec(codec_backend, "HS256", secret_key="x" * 32)
+
+        assert codec.decode(codec.encode(self.CLAIMS)) == self.CLAIMS
+
+    def test_invalid_signature(self, codec_backend):
+        """Un token firmado con otra clave se rechaza con TokenError"""
+        codec = build_token_codec(codec_backend, "HS256", secret_key="x" * 32)
+        other = build_token_codec(codec_backend, "HS256", secret_key="y" * 32)
+
+        with pytest.raises(TokenError):
+            codec.decode(other.encode(self.CLAIMS))
+
+    def test_expired_token(self, codec_backend):
+        """Los tokens expirados se rechazan"""
+        codec = build_token_codec(codec_backend, "HS256", secret_key="x" * 32)
+
+        with pytest.raises(TokenError):
+            codec.decode(codec.encode({**self.CLAIMS, "exp": 1}))
+
+    def test_asymmetric_verification_only(self, codec_backend):
+        """Con solo la clave pública se puede verificar pero no firmar"""
+        private_pem, public_pem = _es256_keys()
+        issuer = build_token_codec(
+            codec_backend, "ES256", private_key=private_pem, public_key=public_pem
+        )
+        verifier = build_token_codec(codec_backend, "ES256", public_key=public_pem)
+
+        assert verifier.decode(issuer.encode(self.CLAIMS)) == self.CLAIMS
+        with pytest.raises(RuntimeError):
+            verifier.encode(self.CLAIMS)
+
+    def test_backends_interoperate(self):
+        """Un token de jose se verifica con PyJWT y viceversa"""
+        pytest.importorskip("jwt")
+        jose_codec = build_token_codec("jose", "HS256", secret_key="x" * 32)
+        pyjwt_codec = build_token_codec("pyjwt", "HS256", secret_key="x" * 32)
+
+        assert pyjwt_codec.decode(jose_codec.encode(self.CLAIMS)) == self.CLAIMS
+        assert jose_codec.decode(pyjwt_codec.encode(self.CLAIMS)) == self.CLAIMS
+
+
+class TestTokenCache:
+    """Tests de la memoización de tokens verificados"""
+
+    def test_repeated_token_served_from_cache(self):
+        """El mismo token solo se verifica una vez"""
+        token = create_access_token(data={"sub": "1"})
+        first = decode_token(token)
+        hits = token_cache.hits
+
+        second = decode_token(token)
+
+        assert second == first
+        assert token_cache.hits == hits + 1
+
+    def test_returns_copy(self):
+        """Modificar el payload devuelto no altera la cache"""
+        token = create_access_token(data={"sub": "1"})
+        decode_token(token)["sub"] = 1
+
+        assert decode_token(token)["sub"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_tampered_token_rejected(self, client: AsyncClient, auth_headers):
+        """Un token alterado no coincide con la entrada cacheada"""
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        tampered = {"Authorization": auth_headers["Authorization"][:-2] + "xx"}
+
+        response = await client.get("/api/v1/auth/me", headers=tampered)
+
+        assert response.status_code == 401
+
+
+class TestPasswordHashExecutor:
+    """Tests del pool de hashing de passwords"""
+
+    @pytest.mark.asyncio
+    async def test_runs_off_event_loop(self):
+        """El trabajo se ejecuta en un hilo distinto al del event loop"""
+        executor = PasswordHashExecutor(max_workers=1, queue_limit=0)
+
+        thread_name = await executor.run(lambda: threading.current_thread().name)
+
+        assert thread_name.startswith("password-hash")
+        assert executor.stats()["completed"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        """Responde 503 en lugar de encolar cuando el pool está lleno"""
+        executor = PasswordHashExecutor(max_workers=1, queue_limit=0)
+        release = threading.Event()
+        busy = asyncio.ensure_future(executor.run(release.wait, 5))
+        await asyncio.sleep(0)
+
+        assert executor.stats()["in_flight"] == 1
+        with pytest.raises(ServiceUnavailableException) as exc_info:
+            await executor.run(sum, [1, 2])
+
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "1"
+
+        release.set()
+        await busy
+        stats = executor.stats()
+        assert stats["rejected"] == 1
+        assert stats["in_flight"] == 0
+        executor.shutdown()
+
+
+class TestSelfContainedTokens:
+    """Tests de access tokens autocontenidos"""
+
+    @pytest.fixture(autouse=True)
+    def self_contained(self, monkeypatch):
+        monkeypatch.setattr(settings, "ACCESS_TOKEN_SELF_CONTAINED", True)
+
+    async def _login(self, client: AsyncClient, user_data) -> str:
+        response = await client.post(
+            "/api/v1/auth/login",
+            data={"username": user_data["email"], "password": user_data["password"]}
+        )
+        return response.json()["access_token"]
+
+    @pytest.mark.asyncio
+    async def test_token_includes_claims(self, client: AsyncClient, user_data, registered_user):
+        """El token lleva estado, username y versión"""
+        token = await self._login(client, user_data)
+
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+
+        assert payload["act"] is True
+        assert payload["usr"] == registered_user["username"]
+        assert payload["ver"] == 0
+
+    @pytest.mark.asyncio
+    async def test_authorizes_without_user_lookup(
+            self, client: AsyncClient, user_data, registered_user, query_counter
+    ):
+        """Las peticiones autenticadas no consultan la tabla users"""
+        token = await self._login(client, user_data)
+        query_counter.clear()
+
+        response = await client.get(
+            "/api/v1/boards/", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        assert not any("FROM users" in statement for statement in query_counter)
+
+    @pytest.mark.asyncio
+    async def test_revoked_token_rejected(
+            self, client: AsyncClient, db_session, user_data, registered_user
+    ):
+        """Incrementar token_version revoca los tokens emitidos"""
+        token = await self._login(client, user_data)
+        headers = {"Authorization": f"Bearer {token}"}
+        assert (await client.get("/api/v1/boards/", headers=headers)).status_code == 200
+
+        db_user = await user_crud.get(db_session, id=registered_user["id"])
+        await user_crud.revoke_tokens(db_session, db_obj=db_user)
+
+        response = await client.get("/api/v1/boards/", headers=headers)
+        assert response.status_code == 401
+
+        new_token = await self._login(client, user_data)
+        response = await client.get(
+            "/api/v1/boards/", headers={"Authorization": f"Bearer {new_token}"}
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_deactivated_user_rejected(
+            self, client: AsyncClient, db_session, user_data, registered_user
+    ):
+        """Desactivar al usuario revoca sus tokens"""
+        token = await self._login(client, user_data)
+
+        db_user = await user_crud.get(db_session, id=registered_user["id"])
+        await user_crud.update(db_session, db_obj=db_user, obj_in={"is_active": False})
+
+        response = await client.get(
+            "/api/v1/boards/", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert response.status_code == 401
+
+    def test_rejected_with_several_workers(self):
+        """Sin un registro compartido de revocaciones solo se admite un proceso"""
+        with pytest.raises(ValidationError):
+            Settings(ACCESS_TOKEN_SELF_CONTAINED=True, WEB_CONCURRENCY=4)
+
+        assert Settings(ACCESS_TOKEN_SELF_CONTAINED=True, WEB_CONCURRENCY=1).ACCESS_TOKEN_SELF_CONTAINED
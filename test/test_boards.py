@@ -1,6 +1,8 @@
 import pytest
 from httpx import AsyncClient
 
+from app.core.pagination import encode_cursor
+
 
 class TestBoardCreate:
     """Tests de creación de boards"""
@@ -134,6 +136,74 @@ class TestBoardList:
         response = await client.get("/api/v1/boards/?skip=10&limit=10", headers=auth_headers)
         assert len(response.json()) == 5
 
+    @pytest.mark.asyncio
+    async def test_list_boards_cursor(self, client: AsyncClient, auth_headers):
+        """Paginación por cursor de boards"""
+        for i in range(5):
+            await client.post(
+                "/api/v1/boards/",
+                json={"title": f"Board {i}"},
+                headers=auth_headers
+            )
+
+        response = await client.get("/api/v1/boards/?limit=2", headers=auth_headers)
+        titles = [b["title"] for b in response.json()]
+        cursor = response.headers["X-Next-Cursor"]
+        while cursor:
+            response = await client.get(
+                f"/api/v1/boards/?limit=2&cursor={cursor}", headers=auth_headers
+            )
+            titles += [b["title"] for b in response.json()]
+            cursor = response.headers.get("X-Next-Cursor")
+
+        assert titles == [f"Board {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_list_boards_cursor_stable_under_inserts(self, client: AsyncClient, auth_headers):
+        """Crear boards entre páginas no repite ni salta resultados"""
+        for i in range(4):
+            await client.post("/api/v1/boards/", json={"title": f"Board {i}"}, headers=auth_headers)
+
+        response = await client.get("/api/v1/boards/?limit=2", headers=auth_headers)
+        first_page = [b["id"] for b in response.json()]
+        await client.post("/api/v1/boards/", json={"title": "Nuevo"}, headers=auth_headers)
+
+        response = await client.get(
+            f"/api/v1/boards/?limit=2&cursor={response.headers['X-Next-Cursor']}",
+            headers=auth_headers
+        )
+        second_page = [b["id"] for b in response.json()]
+
+        assert not set(first_page) & set(second_page)
+        assert second_page == sorted(second_page)
+
+    @pytest.mark.asyncio
+    async def test_list_boards_sparse_fields(self, client: AsyncClient, auth_headers):
+        """?fields= devuelve solo los campos pedidos y mantiene el cursor"""
+        for i in range(2):
+            await client.post(
+                "/api/v1/boards/",
+                json={"title": f"Board {i}", "description": "Larga"},
+                headers=auth_headers
+            )
+
+        response = await client.get("/api/v1/boards/?limit=1&fields=title", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert list(response.json()[0]) == ["id", "title"]
+        assert "X-Next-Cursor" in response.headers
+
+    @pytest.mark.asyncio
+    async def test_list_boards_invalid_cursor(self, client: AsyncClient, auth_headers):
+        """Un cursor inválido devuelve 400"""
+        response = await client.get("/api/v1/boards/?cursor=no-es-un-cursor", headers=auth_headers)
+        assert response.status_code == 400
+
+        response = await client.get(
+            "/api/v1/boards/", params={"cursor": encode_cursor("1")}, headers=auth_headers
+        )
+        assert response.status_code == 400
+
 
 class TestBoardDetail:
     """Tests de detalle de board"""
@@ -285,3 +355,92 @@ class TestBoardDelete:
         )
 
         assert response.status_code == 403
+
+
+class TestBoardFull:
+    """Tests del snapshot completo de un tablero"""
+
+    async def _board_with_lists(self, client: AsyncClient, auth_headers, lists: int) -> int:
+        response = await client.post("/api/v1/boards/", json={"title": "Board"}, headers=auth_headers)
+        board_id = response.json()["id"]
+        for i in reversed(range(lists)):
+            response = await client.post(
+                "/api/v1/lists/",
+                json={"title": f"Lista {i}", "board_id": board_id, "position": i},
+                headers=auth_headers
+            )
+            list_id = response.json()["id"]
+            for j in reversed(range(3)):
+                await client.post(
+                    "/api/v1/tasks/",
+                    json={"title": f"Tarea {i}.{j}", "list_id": list_id, "position": j},
+                    headers=auth_headers
+                )
+        return board_id
+
+    @pytest.mark.asyncio
+    async def test_get_board_full_ordered(self, client: AsyncClient, auth_headers):
+        """Devuelve listas y tareas ordenadas por posición"""
+        board_id = await self._board_with_lists(client, auth_headers, lists=2)
+
+        response = await client.get(f"/api/v1/boards/{board_id}/full", headers=auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [l["title"] for l in data["lists"]] == ["Lista 0", "Lista 1"]
+        assert [t["title"] for t in data["lists"][1]["tasks"]] == [
+            "Tarea 1.0", "Tarea 1.1", "Tarea 1.2"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_get_board_full_limits_tasks_per_list(self, client: AsyncClient, auth_headers):
+        """Cada lista trae como mucho tasks_limit tareas y el cursor del resto"""
+        board_id = await self._board_with_lists(client, auth_headers, lists=2)
+
+        response = await client.get(
+            f"/api/v1/boards/{board_id}/full", params={"tasks_limit": 2}, headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        for i, list_data in enumerate(response.json()["lists"]):
+            assert [t["title"] for t in list_data["tasks"]] == [f"Tarea {i}.0", f"Tarea {i}.1"]
+            rest = await client.get(
+                f"/api/v1/tasks/list/{list_data['id']}",
+                params={"cursor": list_data["tasks_next_cursor"]},
+                headers=auth_headers
+            )
+            assert [t["title"] for t in rest.json()] == [f"Tarea {i}.2"]
+
+        response = await client.get(f"/api/v1/boards/{board_id}/full", headers=auth_headers)
+        assert all(l["tasks_next_cursor"] is None for l in response.json()["lists"])
+
+    @pytest.mark.asyncio
+    async def test_get_board_full_constant_queries(
+            self, client: AsyncClient, auth_headers, query_counter
+    ):
+        """El número de consultas no depende del número de listas"""
+        counts = []
+        for lists in (1, 6):
+            board_id = await self._board_with_lists(client, auth_headers, lists=lists)
+            await client.get("/api/v1/auth/me", headers=auth_headers)
+            query_counter.clear()
+
+            response = await client.get(f"/api/v1/boards/{board_id}/full", headers=auth_headers)
+
+            assert response.status_code == 200
+            counts.append(len(query_counter))
+
+        assert counts == [3, 3]
+
+    @pytest.mark.asyncio
+    async def test_get_board_full_no_permission(
+            self, client: AsyncClient, auth_headers, second_auth_headers, query_counter
+    ):
+        """No puede ver el snapshot de un board ajeno, y no se llega a cargar"""
+        board_id = await self._board_with_lists(client, auth_headers, lists=1)
+        query_counter.clear()
+
+        response = await client.get(f"/api/v1/boards/{board_id}/full", headers=second_auth_headers)
+
+        assert response.status_code == 403
+        assert not [q for q in query_counter if "FROM lists" in q or "FROM tasks" in q]
@@ -1,6 +1,9 @@
 import pytest
 from httpx import AsyncClient
 
+from app.core.config import settings
+from app.crud.task import task as task_crud
+
 
 @pytest.fixture
 async def board(client: AsyncClient, auth_headers):
@@ -78,6 +81,23 @@ class TestListOperations:
         data = response.json()
         assert len(data) == 3
 
+    @pytest.mark.asyncio
+    async def test_list_lists_sparse_fields(self, client: AsyncClient, auth_headers, board):
+        """?fields= devuelve solo los campos pedidos"""
+        await client.post(
+            "/api/v1/lists/",
+            json={"title": "Lista", "board_id": board["id"]},
+            headers=auth_headers
+        )
+
+        response = await client.get(
+            f"/api/v1/lists/board/{board['id']}?fields=title,position",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()[0].keys() == {"id", "title", "position"}
+
     @pytest.mark.asyncio
     async def test_update_list(self, client: AsyncClient, auth_headers, board):
         """Actualizar lista"""
@@ -116,4 +136,178 @@ class TestListOperations:
             headers=auth_headers
         )
 
-        assert response.status_code == 204
\ No newline at end of file
+        assert response.status_code == 204
+
+
+class TestReorder:
+    """Tests de reordenación en bloque"""
+
+    @pytest.mark.asyncio
+    async def test_reorder_tasks(self, client: AsyncClient, auth_headers, board, query_counter):
+        """Aplica todas las posiciones con un solo UPDATE"""
+        list_response = await client.post(
+            "/api/v1/lists/", json={"title": "Lista", "board_id": board["id"]}, headers=auth_headers
+        )
+        list_id = list_response.json()["id"]
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Tarea {i}", "list_id": list_id, "position": i} for i in range(4)]},
+            headers=auth_headers
+        )
+        ids = [t["id"] for t in response.json()]
+        query_counter.clear()
+
+        response = await client.post(
+            f"/api/v1/lists/{list_id}/reorder",
+            json={"ids": list(reversed(ids))},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 204
+        assert len([q for q in query_counter if q.startswith("UPDATE tasks")]) == 1
+        response = await client.get(f"/api/v1/tasks/list/{list_id}", headers=auth_headers)
+        assert [t["title"] for t in response.json()] == [f"Tarea {i}" for i in reversed(range(4))]
+
+    @pytest.mark.asyncio
+    async def test_reorder_rejects_foreign_ids(self, client: AsyncClient, auth_headers, board):
+        """Un id de otra lista rechaza todo el reordenamiento"""
+        lists = []
+        for title in ("A", "B"):
+            response = await client.post(
+                "/api/v1/lists/", json={"title": title, "board_id": board["id"]}, headers=auth_headers
+            )
+            lists.append(response.json()["id"])
+        tasks = []
+        for list_id in lists:
+            response = await client.post(
+                "/api/v1/tasks/",
+                json={"title": "Tarea", "list_id": list_id, "position": 5},
+                headers=auth_headers
+            )
+            tasks.append(response.json()["id"])
+
+        response = await client.post(
+            f"/api/v1/lists/{lists[0]}/reorder", json={"ids": tasks}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        response = await client.get(f"/api/v1/tasks/{tasks[0]}", headers=auth_headers)
+        assert response.json()["position"] == 5
+
+    @pytest.mark.asyncio
+    async def test_reorder_requires_every_task(self, client: AsyncClient, auth_headers, board):
+        """Un subconjunto de las tareas se rechaza: dejaría posiciones repetidas"""
+        list_response = await client.post(
+            "/api/v1/lists/", json={"title": "Lista", "board_id": board["id"]}, headers=auth_headers
+        )
+        list_id = list_response.json()["id"]
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Tarea {i}", "list_id": list_id, "position": i} for i in range(3)]},
+            headers=auth_headers
+        )
+        ids = [t["id"] for t in response.json()]
+
+        response = await client.post(
+            f"/api/v1/lists/{list_id}/reorder", json={"ids": [ids[2]]}, headers=auth_headers
+        )
+
+        assert response.status_code == 400
+        response = await client.get(f"/api/v1/tasks/list/{list_id}", headers=auth_headers)
+        assert [t["position"] for t in response.json()] == [0, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_reorder_more_than_bulk_max(self, client: AsyncClient, auth_headers, board):
+        """Una lista con más tareas que TASK_BULK_MAX se puede reordenar entera"""
+        list_response = await client.post(
+            "/api/v1/lists/", json={"title": "Lista", "board_id": board["id"]}, headers=auth_headers
+        )
+        list_id = list_response.json()["id"]
+        ids = []
+        for count in (settings.TASK_BULK_MAX, 1):
+            response = await client.post(
+                "/api/v1/tasks/bulk",
+                json={"tasks": [{"title": "Tarea", "list_id": list_id} for _ in range(count)]},
+                headers=auth_headers
+            )
+            ids += [t["id"] for t in response.json()]
+
+        response = await client.post(
+            f"/api/v1/lists/{list_id}/reorder",
+            json={"ids": list(reversed(ids))},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 204
+        response = await client.get(
+            f"/api/v1/tasks/list/{list_id}",
+            params={"limit": settings.TASK_PAGE_SIZE_MAX},
+            headers=auth_headers
+        )
+        assert [t["id"] for t in response.json()] == list(reversed(ids))[:settings.TASK_PAGE_SIZE_MAX]
+
+    @pytest.mark.asyncio
+    async def test_reorder_in_batches(self, client: AsyncClient, auth_headers, db_session, board):
+        """Con varios lotes cada tarea recibe su índice global"""
+        list_response = await client.post(
+            "/api/v1/lists/", json={"title": "Lista", "board_id": board["id"]}, headers=auth_headers
+        )
+        list_id = list_response.json()["id"]
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [{"title": f"Tarea {i}", "list_id": list_id} for i in range(5)]},
+            headers=auth_headers
+        )
+        ids = [t["id"] for t in response.json()]
+
+        assert await task_crud.reorder(
+            db_session, ids=list(reversed(ids)), parent="list_id", parent_id=list_id, batch_size=2
+        )
+
+        response = await client.get(f"/api/v1/tasks/list/{list_id}", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == list(reversed(ids))
+        assert [t["position"] for t in response.json()] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_reorder_duplicate_ids(self, client: AsyncClient, auth_headers, board):
+        """Ids repetidos se rechazan"""
+        list_response = await client.post(
+            "/api/v1/lists/", json={"title": "Lista", "board_id": board["id"]}, headers=auth_headers
+        )
+
+        response = await client.post(
+            f"/api/v1/lists/{list_response.json()['id']}/reorder",
+            json={"ids": [1, 1]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_reorder_lists(self, client: AsyncClient, auth_headers, board, second_auth_headers):
+        """Reordena las listas de un tablero; otro usuario no puede"""
+        ids = []
+        for i in range(3):
+            response = await client.post(
+                "/api/v1/lists/",
+                json={"title": f"Lista {i}", "position": i, "board_id": board["id"]},
+                headers=auth_headers
+            )
+            ids.append(response.json()["id"])
+        new_order = [ids[2], ids[0], ids[1]]
+
+        response = await client.post(
+            f"/api/v1/boards/{board['id']}/reorder-lists",
+            json={"ids": new_order},
+            headers=second_auth_headers
+        )
+        assert response.status_code == 403
+
+        response = await client.post(
+            f"/api/v1/boards/{board['id']}/reorder-lists",
+            json={"ids": new_order},
+            headers=auth_headers
+        )
+        assert response.status_code == 204
+        response = await client.get(f"/api/v1/lists/board/{board['id']}", headers=auth_headers)
+        assert [l["id"] for l in response.json()] == new_order
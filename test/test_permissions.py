@@ -1,5 +1,9 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.crud.list import list_board_cache
 
 
 class TestPermissions:
@@ -90,3 +94,113 @@ class TestPermissions:
 
         assert response.status_code == 403
 
+
+    @pytest.mark.asyncio
+    async def test_cannot_access_other_user_task_or_list(
+            self, client: AsyncClient, auth_headers, second_auth_headers, board
+    ):
+        """No puede leer ni modificar listas o tareas de otro usuario"""
+        list_response = await client.post(
+            "/api/v1/lists/",
+            json={"title": "Lista", "position": 0, "board_id": board["id"]},
+            headers=auth_headers
+        )
+        list_id = list_response.json()["id"]
+        task_response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_id},
+            headers=auth_headers
+        )
+        task_id = task_response.json()["id"]
+
+        assert (await client.get(
+            f"/api/v1/tasks/{task_id}", headers=second_auth_headers
+        )).status_code == 403
+        assert (await client.delete(
+            f"/api/v1/tasks/{task_id}", headers=second_auth_headers
+        )).status_code == 403
+        assert (await client.get(
+            f"/api/v1/lists/{list_id}", headers=second_auth_headers
+        )).status_code == 403
+        assert (await client.put(
+            f"/api/v1/lists/{list_id}", json={"title": "Hack"}, headers=second_auth_headers
+        )).status_code == 403
+
+
+class TestOwnershipCache:
+    """Tests de la cache compartida de owners de tableros y listas"""
+
+    @pytest.mark.asyncio
+    async def test_permission_check_reused_across_requests(
+            self, client: AsyncClient, auth_headers, list_fixture, monkeypatch
+    ):
+        """Una vez resuelto el owner de una lista, otras peticiones no lo consultan"""
+        monkeypatch.setattr(settings, "AUTHZ_DEBUG_HEADERS", True)
+        await client.get(f"/api/v1/lists/{list_fixture['id']}", headers=auth_headers)
+
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        assert response.headers["X-Authz-Queries"] == "0"
+        assert response.headers["X-Authz-Saved"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_cached_owner_still_forbids_other_user(
+            self, client: AsyncClient, auth_headers, second_auth_headers, list_fixture
+    ):
+        """El owner cacheado sigue bloqueando a otros usuarios"""
+        await client.get(f"/api/v1/lists/{list_fixture['id']}", headers=auth_headers)
+
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=second_auth_headers
+        )
+
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_deleted_list_evicted(self, client: AsyncClient, auth_headers, list_fixture):
+        """Eliminar una lista la quita de la cache"""
+        await client.get(f"/api/v1/lists/{list_fixture['id']}", headers=auth_headers)
+        assert list_board_cache.get(list_fixture["id"]) is not None
+
+        await client.delete(f"/api/v1/lists/{list_fixture['id']}", headers=auth_headers)
+
+        assert list_board_cache.get(list_fixture["id"]) is None
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_list_deleted_by_other_process(
+            self, client: AsyncClient, auth_headers, db_session, list_fixture
+    ):
+        """Si otro proceso borró la lista, la entrada cacheada da 404 y no 500"""
+        await client.get(f"/api/v1/lists/{list_fixture['id']}", headers=auth_headers)
+        # Borrado sin pasar por el ORM: la cache de este proceso no se entera
+        await db_session.execute(text("DELETE FROM lists WHERE id = :id"), {"id": list_fixture["id"]})
+        await db_session.commit()
+        assert list_board_cache.get(list_fixture["id"]) is not None
+
+        for url, body in (
+                ("/api/v1/tasks/", {"title": "Tarea", "list_id": list_fixture["id"]}),
+                ("/api/v1/tasks/bulk", {"tasks": [{"title": "Tarea", "list_id": list_fixture["id"]}]}),
+        ):
+            list_board_cache.set(list_fixture["id"], list_fixture["board_id"])
+            response = await client.post(url, json=body, headers=auth_headers)
+
+            assert response.status_code == 404
+            assert list_board_cache.get(list_fixture["id"]) is None
+
+        count = await db_session.execute(
+            text("SELECT COUNT(*) FROM tasks WHERE list_id = :id"), {"id": list_fixture["id"]}
+        )
+        assert count.scalar() == 0
@@ -1,5 +1,15 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.core.pagination import encode_cursor
+from app.core.ranking import RANK_DEFAULT, rank_after, rank_between
+from app.crud.counters import repair_task_counters
+from app.crud.task import task as task_crud
+from app.db.models.board import Board
+from app.db.models.list import List
+from app.db.models.task import Task
 
 
 @pytest.fixture
@@ -70,6 +80,75 @@ class TestTaskCreate:
         assert data["priority"] == "medium"  # Default
 
 
+class TestTaskBulkCreate:
+    """Tests de creación masiva de tareas"""
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_keeps_order(
+            self, client: AsyncClient, auth_headers, list_fixture, second_list, query_counter
+    ):
+        """Crea tareas en varias listas con un solo INSERT y respeta el orden"""
+        lists = [list_fixture["id"], second_list["id"]]
+        payload = [
+            {"title": f"Tarea {i}", "list_id": lists[i % 2], "priority": "high", "description": "d"}
+            for i in range(6)
+        ]
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        query_counter.clear()
+
+        response = await client.post(
+            "/api/v1/tasks/bulk", json={"tasks": payload}, headers=auth_headers
+        )
+
+        assert response.status_code == 201
+        data = response.json()
+        assert [t["title"] for t in data] == [t["title"] for t in payload]
+        assert [t["list_id"] for t in data] == [t["list_id"] for t in payload]
+        assert data[0]["description"] == "d"
+        inserts = [q for q in query_counter if q.startswith("INSERT INTO tasks")]
+        assert len(inserts) == 1
+
+        response = await client.get(f"/api/v1/lists/{second_list['id']}", headers=auth_headers)
+        assert response.json()["high_count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_other_user_list(
+            self, client: AsyncClient, auth_headers, second_auth_headers, list_fixture
+    ):
+        """Si alguna lista es ajena no se crea ninguna tarea"""
+        other_board = await client.post(
+            "/api/v1/boards/", json={"title": "Ajeno"}, headers=second_auth_headers
+        )
+        other_list = await client.post(
+            "/api/v1/lists/",
+            json={"title": "Ajena", "board_id": other_board.json()["id"]},
+            headers=second_auth_headers
+        )
+        payload = [
+            {"title": "Mía", "list_id": list_fixture["id"]},
+            {"title": "Ajena", "list_id": other_list.json()["id"]},
+        ]
+
+        response = await client.post(
+            "/api/v1/tasks/bulk", json={"tasks": payload}, headers=auth_headers
+        )
+
+        assert response.status_code == 403
+        response = await client.get(f"/api/v1/tasks/list/{list_fixture['id']}", headers=auth_headers)
+        assert response.json() == []
+
+    @pytest.mark.asyncio
+    async def test_bulk_create_limit(self, client: AsyncClient, auth_headers, list_fixture):
+        """No se aceptan más de TASK_BULK_MAX tareas"""
+        payload = [{"title": "T", "list_id": list_fixture["id"]}] * (settings.TASK_BULK_MAX + 1)
+
+        response = await client.post(
+            "/api/v1/tasks/bulk", json={"tasks": payload}, headers=auth_headers
+        )
+
+        assert response.status_code == 422
+
+
 class TestTaskOperations:
     """Tests de operaciones con tareas"""
 
@@ -93,6 +172,121 @@ class TestTaskOperations:
         data = response.json()
         assert len(data) == 5
 
+    @pytest.mark.asyncio
+    async def test_list_tasks_cursor(self, client: AsyncClient, auth_headers, list_fixture):
+        """Paginación por cursor en orden (position, id)"""
+        for i, position in enumerate([2, 0, 1, 0, 2]):
+            await client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Tarea {i}", "list_id": list_fixture["id"], "position": position},
+                headers=auth_headers
+            )
+
+        url = f"/api/v1/tasks/list/{list_fixture['id']}?limit=2"
+        response = await client.get(url, headers=auth_headers)
+        pages = [response.json()]
+        while "X-Next-Cursor" in response.headers:
+            response = await client.get(
+                f"{url}&cursor={response.headers['X-Next-Cursor']}", headers=auth_headers
+            )
+            pages.append(response.json())
+
+        tasks = [t for page in pages for t in page]
+        assert [t["title"] for t in tasks] == ["Tarea 1", "Tarea 3", "Tarea 2", "Tarea 0", "Tarea 4"]
+        assert [len(page) for page in pages] == [2, 2, 1]
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_cursor_wrong_types(self, client: AsyncClient, auth_headers, list_fixture):
+        """Un cursor con valores de otro tipo que la clave de orden devuelve 400"""
+        url = f"/api/v1/tasks/list/{list_fixture['id']}"
+        for values in ((0, "i", "1"), ("0", "i", 1), (0, 1, 1), (0, "i", True)):
+            response = await client.get(
+                url, params={"cursor": encode_cursor(*values)}, headers=auth_headers
+            )
+            assert response.status_code == 400, values
+
+        response = await client.get(
+            url, params={"cursor": encode_cursor(0, "i", 1)}, headers=auth_headers
+        )
+        assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_sparse_fields(
+            self, client: AsyncClient, auth_headers, list_fixture, query_counter
+    ):
+        """?fields= limita las columnas consultadas y los campos devueltos"""
+        await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "description": "x" * 1000, "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        query_counter.clear()
+
+        response = await client.get(
+            f"/api/v1/tasks/list/{list_fixture['id']}?fields=title,priority",
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json() == [
+            {"id": response.json()[0]["id"], "title": "Tarea", "priority": "medium"}
+        ]
+        select_tasks = [q for q in query_counter if "FROM tasks" in q]
+        assert select_tasks and "description" not in select_tasks[-1]
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_unknown_field(self, client: AsyncClient, auth_headers, list_fixture):
+        """Un campo desconocido en ?fields= devuelve 400"""
+        response = await client.get(
+            f"/api/v1/tasks/list/{list_fixture['id']}?fields=title,secret",
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_list_tasks_bounded(
+            self, client: AsyncClient, auth_headers, list_fixture, monkeypatch
+    ):
+        """Sin limit se devuelve una página por defecto y el total en X-Total-Count"""
+        for i in range(4):
+            await client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Tarea {i}", "list_id": list_fixture["id"]},
+                headers=auth_headers
+            )
+        url = f"/api/v1/tasks/list/{list_fixture['id']}"
+
+        response = await client.get(f"{url}?limit=3", headers=auth_headers)
+        assert len(response.json()) == 3
+        assert response.headers["X-Total-Count"] == "4"
+
+        too_big = settings.TASK_PAGE_SIZE_MAX + 1
+        response = await client.get(f"{url}?limit={too_big}", headers=auth_headers)
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_get_list_embeds_first_tasks(self, client: AsyncClient, auth_headers, list_fixture):
+        """GET /lists/{id} incluye las primeras N tareas y un cursor para el resto"""
+        for i in range(5):
+            await client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Tarea {i}", "list_id": list_fixture["id"], "position": i},
+                headers=auth_headers
+            )
+
+        response = await client.get(
+            f"/api/v1/lists/{list_fixture['id']}?tasks_limit=2", headers=auth_headers
+        )
+        data = response.json()
+        assert [t["title"] for t in data["tasks"]] == ["Tarea 0", "Tarea 1"]
+        assert response.headers["X-Total-Count"] == "5"
+
+        response = await client.get(
+            f"/api/v1/tasks/list/{list_fixture['id']}?cursor={data['tasks_next_cursor']}",
+            headers=auth_headers
+        )
+        assert [t["title"] for t in response.json()] == ["Tarea 2", "Tarea 3", "Tarea 4"]
+
     @pytest.mark.asyncio
     async def test_get_task_detail(self, client: AsyncClient, auth_headers, list_fixture):
         """Obtener detalle de tarea"""
@@ -169,6 +363,27 @@ class TestTaskOperations:
         assert get_response.status_code == 404
 
 
+    @pytest.mark.asyncio
+    async def test_delete_task_skips_description(
+            self, client: AsyncClient, auth_headers, list_fixture, query_counter
+    ):
+        """Eliminar una tarea no lee su descripción"""
+        create_response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "description": "x" * 1000, "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        query_counter.clear()
+
+        response = await client.delete(
+            f"/api/v1/tasks/{create_response.json()['id']}", headers=auth_headers
+        )
+
+        assert response.status_code == 204
+        selects = [q for q in query_counter if q.startswith("SELECT") and "FROM tasks" in q]
+        assert selects and not any("description" in q for q in selects)
+
+
 class TestTaskMove:
     """Tests de mover tareas entre listas"""
 
@@ -217,6 +432,78 @@ class TestTaskMove:
         assert data["list_id"] == second_list["id"]
         assert data["position"] == 5
 
+    @pytest.mark.asyncio
+    async def test_move_task_permission_queries(
+            self, client: AsyncClient, auth_headers, list_fixture, second_list, query_counter
+    ):
+        """
+        Mover una tarea solo lee la tarea con su owner, el owner de la lista
+        destino y el último rank de su posición allí
+        """
+        create_response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        task_id = create_response.json()["id"]
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        query_counter.clear()
+
+        response = await client.post(
+            f"/api/v1/tasks/{task_id}/move",
+            json={"list_id": second_list["id"]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        first_write = next(i for i, q in enumerate(query_counter) if q.startswith("UPDATE"))
+        reads = query_counter[:first_write]
+        assert len(reads) == 3
+        assert "JOIN boards" in reads[0]
+        assert "max(tasks.rank)" in reads[2]
+
+    @pytest.mark.asyncio
+    async def test_move_task_same_list_memoized(
+            self, client: AsyncClient, auth_headers, list_fixture, monkeypatch
+    ):
+        """Reordenar dentro de la misma lista no repite la comprobación de permisos"""
+        monkeypatch.setattr(settings, "AUTHZ_DEBUG_HEADERS", True)
+        create_response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        task_id = create_response.json()["id"]
+
+        response = await client.post(
+            f"/api/v1/tasks/{task_id}/move",
+            json={"list_id": list_fixture["id"], "position": 3},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.headers["X-Authz-Queries"] == "1"
+        assert response.headers["X-Authz-Saved"] == "1"
+
+    @pytest.mark.asyncio
+    async def test_get_task_single_query(
+            self, client: AsyncClient, auth_headers, list_fixture, query_counter
+    ):
+        """Obtener una tarea y verificar permisos es una sola consulta"""
+        create_response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        task_id = create_response.json()["id"]
+        await client.get("/api/v1/auth/me", headers=auth_headers)
+        query_counter.clear()
+
+        response = await client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers)
+
+        assert response.status_code == 200
+        assert len(query_counter) == 1
+
     @pytest.mark.asyncio
     async def test_move_task_to_invalid_list(self, client: AsyncClient, auth_headers, list_fixture):
         """No se puede mover a lista inexistente"""
@@ -235,4 +522,305 @@ class TestTaskMove:
             headers=auth_headers
         )
 
-        assert response.status_code == 404
\ No newline at end of file
+        assert response.status_code == 404
+
+class TestTaskCounters:
+    """Tests de los contadores de tareas de listas y tableros"""
+
+    async def _counts(self, client: AsyncClient, auth_headers, url: str) -> dict:
+        data = (await client.get(url, headers=auth_headers)).json()
+        return {k: v for k, v in data.items() if k.endswith("_count")}
+
+    @pytest.mark.asyncio
+    async def test_null_priority_rejected(self, client: AsyncClient, auth_headers, list_fixture):
+        """priority: null se rechaza y los contadores no cambian"""
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"], "priority": "high"},
+            headers=auth_headers
+        )
+        task_id = response.json()["id"]
+
+        response = await client.put(
+            f"/api/v1/tasks/{task_id}", json={"priority": None}, headers=auth_headers
+        )
+
+        assert response.status_code == 422
+        counts = await self._counts(client, auth_headers, f"/api/v1/lists/{list_fixture['id']}")
+        assert counts["high_count"] == 1 and counts["medium_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_counters_follow_task_changes(
+            self, client: AsyncClient, auth_headers, board, list_fixture, second_list
+    ):
+        """Crear, cambiar prioridad, mover y eliminar actualizan los contadores"""
+        task_ids = []
+        for priority in ("urgent", "urgent", "low"):
+            response = await client.post(
+                "/api/v1/tasks/",
+                json={"title": "Tarea", "list_id": list_fixture["id"], "priority": priority},
+                headers=auth_headers
+            )
+            task_ids.append(response.json()["id"])
+
+        await client.put(f"/api/v1/tasks/{task_ids[0]}", json={"priority": "high"}, headers=auth_headers)
+        await client.post(
+            f"/api/v1/tasks/{task_ids[1]}/move",
+            json={"list_id": second_list["id"]},
+            headers=auth_headers
+        )
+        await client.delete(f"/api/v1/tasks/{task_ids[2]}", headers=auth_headers)
+
+        first = await self._counts(client, auth_headers, f"/api/v1/lists/{list_fixture['id']}")
+        second = await self._counts(client, auth_headers, f"/api/v1/lists/{second_list['id']}")
+        totals = await self._counts(client, auth_headers, f"/api/v1/boards/{board['id']}")
+        assert first == {
+            "task_count": 1, "low_count": 0, "medium_count": 0, "high_count": 1, "urgent_count": 0
+        }
+        assert second["task_count"] == 1 and second["urgent_count"] == 1
+        assert totals == {
+            "task_count": 2, "low_count": 0, "medium_count": 0, "high_count": 1, "urgent_count": 1
+        }
+
+    @pytest.mark.asyncio
+    async def test_delete_list_releases_board_counters(
+            self, client: AsyncClient, auth_headers, board, list_fixture
+    ):
+        """Eliminar una lista descuenta sus tareas del tablero"""
+        await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+
+        await client.delete(f"/api/v1/lists/{list_fixture['id']}", headers=auth_headers)
+
+        totals = await self._counts(client, auth_headers, f"/api/v1/boards/{board['id']}")
+        assert totals["task_count"] == 0
+        assert totals["medium_count"] == 0
+
+    @pytest.mark.asyncio
+    async def test_repair_counters(
+            self, client: AsyncClient, auth_headers, db_session, board, list_fixture
+    ):
+        """repair_task_counters recalcula los contadores desde las tareas"""
+        for priority in ("low", "medium"):
+            await client.post(
+                "/api/v1/tasks/",
+                json={"title": "Tarea", "list_id": list_fixture["id"], "priority": priority},
+                headers=auth_headers
+            )
+        await db_session.execute(
+            update(List).where(List.id == list_fixture["id"]).values(task_count=99, low_count=0)
+        )
+        await db_session.execute(
+            update(Board).where(Board.id == board["id"]).values(task_count=0)
+        )
+        await db_session.commit()
+
+        await repair_task_counters(db_session)
+        db_session.expire_all()
+
+        counts = await self._counts(client, auth_headers, f"/api/v1/lists/{list_fixture['id']}")
+        totals = await self._counts(client, auth_headers, f"/api/v1/boards/{board['id']}")
+        assert counts["task_count"] == 2 and counts["low_count"] == 1
+        assert totals["task_count"] == 2 and totals["medium_count"] == 1
+
+
+class TestRanking:
+    """Tests de las claves de orden fraccionarias"""
+
+    def test_rank_between_orders_keys(self):
+        """La clave generada queda entre sus vecinas"""
+        keys = [RANK_DEFAULT]
+        for i in range(300):
+            index = (i * 7) % (len(keys) + 1)
+            before = keys[index - 1] if index > 0 else None
+            after = keys[index] if index < len(keys) else None
+            key = rank_between(before, after)
+            assert (before is None or before < key) and (after is None or key < after)
+            keys.insert(index, key)
+        assert keys == sorted(keys)
+
+    def test_rank_between_invalid(self):
+        """Vecinas desordenadas o claves inválidas"""
+        with pytest.raises(ValueError):
+            rank_between("b", "a")
+        with pytest.raises(ValueError):
+            rank_between("a0", None)
+
+    def test_rank_after_appends(self):
+        """rank_after genera claves crecientes que crecen despacio"""
+        keys = [rank_after(None)]
+        for _ in range(500):
+            keys.append(rank_after(keys[-1]))
+        assert keys[0] == RANK_DEFAULT
+        assert keys == sorted(set(keys))
+        assert len(keys[-1]) <= 16
+        assert rank_after("az") == "b" and rank_after("zz") == "zz1"
+
+
+class TestTaskPlace:
+    """Tests de mover tareas entre vecinas"""
+
+    async def _tasks(self, client: AsyncClient, auth_headers, list_id: int, positions) -> list:
+        response = await client.post(
+            "/api/v1/tasks/bulk",
+            json={"tasks": [
+                {"title": f"Tarea {i}", "list_id": list_id, "position": position}
+                for i, position in enumerate(positions)
+            ]},
+            headers=auth_headers
+        )
+        return [t["id"] for t in response.json()]
+
+    async def _titles(self, client: AsyncClient, auth_headers, list_id: int) -> list:
+        response = await client.get(f"/api/v1/tasks/list/{list_id}", headers=auth_headers)
+        return [t["title"] for t in response.json()]
+
+    @pytest.mark.asyncio
+    async def test_place_between_updates_one_row(
+            self, client: AsyncClient, auth_headers, list_fixture, second_list, query_counter
+    ):
+        """Colocar entre dos vecinas solo actualiza la tarea movida"""
+        ids = await self._tasks(client, auth_headers, list_fixture["id"], [0, 1, 2])
+        moved = await self._tasks(client, auth_headers, second_list["id"], [0])
+        query_counter.clear()
+
+        response = await client.post(
+            f"/api/v1/tasks/{moved[0]}/move",
+            json={"list_id": list_fixture["id"], "previous_id": ids[0], "next_id": ids[1]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert len([q for q in query_counter if q.startswith("UPDATE tasks")]) == 1
+        assert await self._titles(client, auth_headers, list_fixture["id"]) == [
+            "Tarea 0", "Tarea 0", "Tarea 1", "Tarea 2"
+        ]
+        response = await client.get(f"/api/v1/tasks/list/{list_fixture['id']}", headers=auth_headers)
+        assert [t["id"] for t in response.json()][:2] == [ids[0], moved[0]]
+
+    @pytest.mark.asyncio
+    async def test_created_tasks_get_distinct_ranks(
+            self, client: AsyncClient, auth_headers, db_session, list_fixture, query_counter
+    ):
+        """
+        Las tareas creadas en la misma posición van al final con ranks
+        distintos, así que colocar otra entre ellas no compacta la lista
+        """
+        ids = []
+        for i in range(3):
+            response = await client.post(
+                "/api/v1/tasks/",
+                json={"title": f"Tarea {i}", "list_id": list_fixture["id"]},
+                headers=auth_headers
+            )
+            ids.append(response.json()["id"])
+        ids += await self._tasks(client, auth_headers, list_fixture["id"], [0, 0])
+        result = await db_session.execute(
+            select(Task.rank).filter(Task.list_id == list_fixture["id"]).order_by(Task.id)
+        )
+        ranks = result.scalars().all()
+        assert ranks == sorted(set(ranks))
+
+        query_counter.clear()
+        response = await client.post(
+            f"/api/v1/tasks/{ids[4]}/move",
+            json={"list_id": list_fixture["id"], "previous_id": ids[0], "next_id": ids[1]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert len([q for q in query_counter if q.startswith("UPDATE tasks")]) == 1
+        response = await client.get(f"/api/v1/tasks/list/{list_fixture['id']}", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == [ids[0], ids[4], ids[1], ids[2], ids[3]]
+
+    @pytest.mark.asyncio
+    async def test_place_repeatedly_in_same_gap(self, client: AsyncClient, auth_headers, list_fixture):
+        """Insertar muchas veces en el mismo hueco mantiene el orden"""
+        ids = await self._tasks(client, auth_headers, list_fixture["id"], [0, 1] + [9] * 20)
+        for task_id in ids[2:]:
+            response = await client.post(
+                f"/api/v1/tasks/{task_id}/move",
+                json={"list_id": list_fixture["id"], "next_id": ids[1]},
+                headers=auth_headers
+            )
+            assert response.status_code == 200
+
+        response = await client.get(f"/api/v1/tasks/list/{list_fixture['id']}", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == [ids[0]] + ids[2:] + [ids[1]]
+
+    @pytest.mark.asyncio
+    async def test_place_with_tied_neighbours_compacts(
+            self, client: AsyncClient, auth_headers, db_session, list_fixture
+    ):
+        """Si no cabe un rank entre las vecinas se compacta la lista"""
+        ids = await self._tasks(client, auth_headers, list_fixture["id"], [0, 0, 0])
+        # Ranks empatados como los de filas escritas sin pasar por el CRUD
+        await db_session.execute(
+            update(Task).where(Task.list_id == list_fixture["id"]).values(rank=RANK_DEFAULT)
+        )
+        await db_session.commit()
+
+        response = await client.post(
+            f"/api/v1/tasks/{ids[2]}/move",
+            json={"list_id": list_fixture["id"], "previous_id": ids[0], "next_id": ids[1]},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        response = await client.get(f"/api/v1/tasks/list/{list_fixture['id']}", headers=auth_headers)
+        assert [t["id"] for t in response.json()] == [ids[0], ids[2], ids[1]]
+
+    @pytest.mark.asyncio
+    async def test_place_invalid_neighbour(
+            self, client: AsyncClient, auth_headers, list_fixture, second_list
+    ):
+        """Las vecinas deben estar en la lista destino"""
+        ids = await self._tasks(client, auth_headers, list_fixture["id"], [0, 1])
+
+        response = await client.post(
+            f"/api/v1/tasks/{ids[0]}/move",
+            json={"list_id": second_list["id"], "previous_id": ids[1]},
+            headers=auth_headers
+        )
+        assert response.status_code == 400
+
+        response = await client.post(
+            f"/api/v1/tasks/{ids[0]}/move",
+            json={"list_id": list_fixture["id"], "previous_id": ids[1], "position": 3},
+            headers=auth_headers
+        )
+        assert response.status_code == 422
+
+    @pytest.mark.asyncio
+    async def test_compact_ranks_keeps_order(
+            self, client: AsyncClient, auth_headers, db_session, list_fixture
+    ):
+        """Compactar renumera posiciones y reinicia ranks sin cambiar el orden"""
+        ids = await self._tasks(client, auth_headers, list_fixture["id"], [0, 1, 1])
+        for _ in range(20):
+            await client.post(
+                f"/api/v1/tasks/{ids[2]}/move",
+                json={"list_id": list_fixture["id"], "next_id": ids[1]},
+                headers=auth_headers
+            )
+            await client.post(
+                f"/api/v1/tasks/{ids[1]}/move",
+                json={"list_id": list_fixture["id"], "next_id": ids[2]},
+                headers=auth_headers
+            )
+        before = await self._titles(client, auth_headers, list_fixture["id"])
+        assert list_fixture["id"] in await task_crud.lists_with_long_ranks(
+            db_session, max_length=3, limit=100000
+        )
+
+        await task_crud.compact_ranks(db_session, list_id=list_fixture["id"])
+
+        response = await client.get(f"/api/v1/tasks/list/{list_fixture['id']}", headers=auth_headers)
+        assert [t["title"] for t in response.json()] == before
+        assert [t["position"] for t in response.json()] == [0, 1, 2]
+        assert list_fixture["id"] not in await task_crud.lists_with_long_ranks(
+            db_session, max_length=1, limit=100000
+        )
@@ -0,0 +1,155 @@
+import re
+from typing import Dict, List
+
+import pytest
+from httpx import AsyncClient
+
+WRITE = re.compile(r"^(INSERT INTO|UPDATE) (\w+)")
+
+
+def writes_after_loads(statements: List[str], table: str) -> List[str]:
+    """
+    Comprueba que tras la primera escritura no hay ningún SELECT (el objeto
+    se rellena con RETURNING) y retorna las escrituras sobre `table`.
+    """
+    first_write = next(i for i, s in enumerate(statements) if WRITE.match(s))
+    after = statements[first_write:]
+    assert not [s for s in after if s.startswith("SELECT")], after
+    return [s for s in after if WRITE.match(s).group(2) == table]
+
+
+class TestWriteStatements:
+    """Cada escritura es una sola sentencia ... RETURNING, sin refresh posterior"""
+
+    async def _assert_single_write(
+            self, client: AsyncClient, query_counter, method: str, url: str,
+            body: Dict, table: str, headers: Dict = None,
+    ) -> Dict:
+        query_counter.clear()
+        response = await client.request(method, url, json=body, headers=headers)
+        assert response.status_code in (200, 201), response.text
+
+        writes = writes_after_loads(query_counter, table)
+        assert len(writes) == 1, writes
+        assert "RETURNING" in writes[0]
+        return response.json()
+
+    @pytest.mark.asyncio
+    async def test_register(self, client: AsyncClient, query_counter):
+        """Registrar un usuario es un único INSERT ... RETURNING"""
+        data = await self._assert_single_write(
+            client, query_counter, "POST", "/api/v1/auth/register",
+            {"email": "returning@example.com", "username": "returning", "password": "Test1234"},
+            "users",
+        )
+        assert data["created_at"]
+
+    @pytest.mark.asyncio
+    async def test_board_writes(self, client: AsyncClient, auth_headers, board, query_counter):
+        """Crear y actualizar tableros"""
+        data = await self._assert_single_write(
+            client, query_counter, "POST", "/api/v1/boards/", {"title": "Nuevo"},
+            "boards", auth_headers,
+        )
+        assert data["created_at"] and data["updated_at"]
+
+        data = await self._assert_single_write(
+            client, query_counter, "PUT", f"/api/v1/boards/{board['id']}", {"title": "Otro"},
+            "boards", auth_headers,
+        )
+        assert data["title"] == "Otro"
+        assert data["updated_at"] >= board["updated_at"]
+
+    @pytest.mark.asyncio
+    async def test_list_writes(
+            self, client: AsyncClient, auth_headers, board, list_fixture, query_counter
+    ):
+        """Crear y actualizar listas"""
+        data = await self._assert_single_write(
+            client, query_counter, "POST", "/api/v1/lists/",
+            {"title": "Hecho", "board_id": board["id"]}, "lists", auth_headers,
+        )
+        assert data["created_at"] and data["task_count"] == 0
+
+        data = await self._assert_single_write(
+            client, query_counter, "PUT", f"/api/v1/lists/{list_fixture['id']}",
+            {"title": "Otra"}, "lists", auth_headers,
+        )
+        assert data["title"] == "Otra"
+
+    @pytest.mark.asyncio
+    async def test_task_writes(
+            self, client: AsyncClient, auth_headers, list_fixture, second_list, query_counter
+    ):
+        """Crear, actualizar y mover tareas (los contadores van aparte)"""
+        task = await self._assert_single_write(
+            client, query_counter, "POST", "/api/v1/tasks/",
+            {"title": "Tarea", "description": "Detalle", "list_id": list_fixture["id"]},
+            "tasks", auth_headers,
+        )
+        assert task["created_at"] and task["description"] == "Detalle"
+
+        data = await self._assert_single_write(
+            client, query_counter, "PUT", f"/api/v1/tasks/{task['id']}", {"title": "Editada"},
+            "tasks", auth_headers,
+        )
+        assert data["title"] == "Editada" and data["description"] == "Detalle"
+
+        data = await self._assert_single_write(
+            client, query_counter, "POST", f"/api/v1/tasks/{task['id']}/move",
+            {"list_id": second_list["id"], "position": 3}, "tasks", auth_headers,
+        )
+        assert data["list_id"] == second_list["id"] and data["position"] == 3
+
+        other = await self._assert_single_write(
+            client, query_counter, "POST", "/api/v1/tasks/",
+            {"title": "Vecina", "list_id": second_list["id"]}, "tasks", auth_headers,
+        )
+        query_counter.clear()
+        response = await client.post(
+            f"/api/v1/tasks/{other['id']}/move",
+            json={"list_id": second_list["id"], "next_id": task["id"]},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert len(writes_after_loads(query_counter, "tasks")) == 1
+
+    @pytest.mark.asyncio
+    async def test_noop_update_skips_write(
+            self, client: AsyncClient, auth_headers, list_fixture, query_counter
+    ):
+        """Un PUT sin cambios no emite UPDATE ni modifica updated_at"""
+        response = await client.post(
+            "/api/v1/tasks/",
+            json={"title": "Tarea", "priority": "high", "list_id": list_fixture["id"]},
+            headers=auth_headers
+        )
+        task = response.json()
+
+        query_counter.clear()
+        response = await client.put(
+            f"/api/v1/tasks/{task['id']}",
+            json={"title": "Tarea", "priority": "high"},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        assert response.json()["updated_at"] == task["updated_at"]
+        assert not [q for q in query_counter if WRITE.match(q)]
+
+    @pytest.mark.asyncio
+    async def test_update_writes_changed_columns_only(
+            self, client: AsyncClient, auth_headers, board, query_counter
+    ):
+        """El UPDATE solo incluye las columnas que cambian"""
+        query_counter.clear()
+        response = await client.put(
+            f"/api/v1/boards/{board['id']}",
+            json={"title": board["title"], "description": "Nueva"},
+            headers=auth_headers
+        )
+
+        assert response.status_code == 200
+        writes = writes_after_loads(query_counter, "boards")
+        assert len(writes) == 1
+        assert "description=" in writes[0] and "title=" not in writes[0]